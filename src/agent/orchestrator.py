@@ -26,12 +26,19 @@ logger = logging.getLogger(__name__)
 class BakeryQuotationAgent:
     """Main agent orchestrator for bakery quotations"""
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        db_tool: DatabaseTool | None = None,
+        bom_tool: BOMAPITool | None = None
+    ):
         """
         Initialize the Bakery Quotation Agent
         
         Args:
             config: Application configuration
+            db_tool: Pre-built database tool (defaults to one on config.database_path)
+            bom_tool: Pre-built BOM API tool (defaults to one on config.bom_api_url)
         """
         self.config = config
         self.config.validate()
@@ -40,8 +47,11 @@ class BakeryQuotationAgent:
         self.llm = self._initialize_llm()
 
         # Initialize tool instances
-        self.db_tool = DatabaseTool(self.config.database_path)
-        self.bom_tool = BOMAPITool(self.config.bom_api_url)
+        self.db_tool = db_tool if db_tool is not None else DatabaseTool(self.config.database_path)
+        self.bom_tool = bom_tool if bom_tool is not None else BOMAPITool(
+            self.config.bom_api_url,
+            verify=not self.config.skip_startup_checks
+        )
         self.template_tool = TemplateTool(
             self.config.template_path,
             self.config.output_dir
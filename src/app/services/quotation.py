@@ -1,7 +1,7 @@
 """Quotation service - business logic for quote generation."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 from src.app.config import settings
@@ -16,6 +16,7 @@ from src.converter import UnitConverter
 from src.tools.bom_tool import BOMAPITool
 from src.tools.database_tool import DatabaseTool
 from src.tools.template_tool import QuoteDataBuilder, TemplateTool
+from src.workflow import fetch_costs
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +59,7 @@ class QuotationService:
         material_names = [m.name for m in estimate.materials]
 
         # 2. Query material costs
-        costs = self.db_tool.get_materials_bulk(material_names)
+        costs = fetch_costs(self.db_tool, estimate)
         missing = set(material_names) - set(costs.keys())
         if missing:
             raise ValueError(f"Materials not found in database: {', '.join(missing)}")
@@ -93,10 +94,10 @@ class QuotationService:
         # 4. Calculate pricing
         calculations = self.calculator.calculate_quote(materials_list, estimate.labor_hours)
 
-        # 5. Generate quote ID and dates
-        quote_id = f"Q{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        quote_date = datetime.now().strftime("%Y-%m-%d")
-        valid_until = (datetime.now() + timedelta(days=settings.quote_validity_days)).strftime("%Y-%m-%d")
+        # 5. Generate quote ID and date from one clock read (set_header derives valid_until)
+        now = datetime.now()
+        quote_id = f"Q{now:%Y%m%d_%H%M%S}"
+        quote_date = now.date().isoformat()
 
         # 6. Build quote data
         builder = QuoteDataBuilder()
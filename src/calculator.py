@@ -1,4 +1,6 @@
 """Pricing calculation utilities for bakery quotation system"""
+import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -13,6 +15,23 @@ class MaterialLine:
     line_cost: float
 
 
+@dataclass(slots=True)
+class LineInput:
+    """Costed material line fed into the calculator"""
+    name: str
+    qty: float
+    unit: str
+    unit_cost: float
+    line_cost: float
+
+    def __getitem__(self, key: str) -> Any:
+        """Allow dictionary-style access so inputs mix freely with material dicts"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
 @dataclass
 class QuoteCalculation:
     """Complete quote calculation results"""
@@ -67,6 +86,22 @@ class QuoteCalculation:
         }
 
 
+def _make_pricing_chain(markup_pct: float, vat_pct: float):
+    """
+    Build the markup/VAT chain with the rates bound as closure constants.
+    
+    Returns:
+        Function mapping subtotal to (markup_value, price_before_vat, vat_value, total)
+    """
+    def chain(subtotal: float) -> tuple[float, float, float, float]:
+        markup_value = subtotal * markup_pct
+        price_before_vat = subtotal + markup_value
+        vat_value = price_before_vat * vat_pct
+        return markup_value, price_before_vat, vat_value, price_before_vat + vat_value
+
+    return chain
+
+
 class PricingCalculator:
     """
     Calculate quote totals with markup and VAT.
@@ -96,19 +131,42 @@ class PricingCalculator:
             raise ValueError("VAT percentage must be between 0 and 1")
 
         self.labor_rate = labor_rate
-        self.markup_pct = markup_pct
-        self.vat_pct = vat_pct
+        self._markup_pct = markup_pct
+        self._vat_pct = vat_pct
+
+        # Specialize the pricing chain for the rates; rebuilt if either rate is reassigned
+        self._price_chain = _make_pricing_chain(markup_pct, vat_pct)
+
+    @property
+    def markup_pct(self) -> float:
+        """Markup percentage as decimal (0.30 = 30%)"""
+        return self._markup_pct
+
+    @markup_pct.setter
+    def markup_pct(self, value: float):
+        self._markup_pct = value
+        self._price_chain = _make_pricing_chain(value, self._vat_pct)
+
+    @property
+    def vat_pct(self) -> float:
+        """VAT percentage as decimal (0.20 = 20%)"""
+        return self._vat_pct
+
+    @vat_pct.setter
+    def vat_pct(self, value: float):
+        self._vat_pct = value
+        self._price_chain = _make_pricing_chain(self._markup_pct, value)
 
     def calculate_quote(
         self,
-        materials: list[dict[str, Any]],
+        materials: Sequence[dict[str, Any] | LineInput],
         labor_hours: float
     ) -> QuoteCalculation:
         """
         Calculate complete quote with all totals.
         
         Args:
-            materials: List of material dicts with keys:
+            materials: List of material dicts or LineInput records with keys:
                 - name: Material name
                 - qty: Quantity needed
                 - unit: Unit of measurement
@@ -131,8 +189,8 @@ class PricingCalculator:
             for m in materials
         ]
 
-        # 1. Materials subtotal
-        materials_subtotal = sum(line.line_cost for line in lines)
+        # 1. Materials subtotal (fsum: exact, so order of lines can't shift the rounding)
+        materials_subtotal = math.fsum(line.line_cost for line in lines)
 
         # 2. Labor cost
         labor_cost = labor_hours * self.labor_rate
@@ -140,13 +198,8 @@ class PricingCalculator:
         # 3. Subtotal (before markup)
         subtotal = materials_subtotal + labor_cost
 
-        # 4. Apply markup
-        markup_value = subtotal * self.markup_pct
-        price_before_vat = subtotal + markup_value
-
-        # 5. Apply VAT
-        vat_value = price_before_vat * self.vat_pct
-        total = price_before_vat + vat_value
+        # 4-5. Apply markup then VAT
+        markup_value, price_before_vat, vat_value, total = self._price_chain(subtotal)
 
         return QuoteCalculation(
             lines=lines,
@@ -191,6 +244,26 @@ class PricingCalculator:
         """
         return round(qty * unit_cost, 2)
 
+    def calculate_line_costs(
+        self,
+        quantities: Sequence[float],
+        unit_costs: Sequence[float]
+    ) -> list[float]:
+        """
+        Calculate costs for many material lines in one pass.
+        
+        Args:
+            quantities: Quantities needed, already in each material's cost unit
+            unit_costs: Cost per unit, aligned with quantities
+            
+        Returns:
+            Line costs rounded to 2 decimals, in input order
+        """
+        return [
+            round(qty * unit_cost, 2)
+            for qty, unit_cost in zip(quantities, unit_costs, strict=True)
+        ]
+
     def apply_discount(
         self,
         calculation: QuoteCalculation,
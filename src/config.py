@@ -43,6 +43,7 @@ class Config:
     # Agent Configuration
     agent_max_iterations: int = 15
     agent_verbose: bool = True
+    skip_startup_checks: bool = False  # Skip the BOM API health check on startup
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -82,6 +83,7 @@ class Config:
             # Agent
             agent_max_iterations=int(os.getenv("AGENT_MAX_ITERATIONS", "15")),
             agent_verbose=os.getenv("AGENT_VERBOSE", "true").lower() == "true",
+            skip_startup_checks=os.getenv("SKIP_STARTUP_CHECKS", "false").lower() == "true",
         )
 
     def validate(self) -> None:
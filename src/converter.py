@@ -51,6 +51,41 @@ class UnitConverter:
         'count': {'each'},
     }
 
+    # Every (from_unit, to_unit) pair within a family, for O(1) can_convert checks
+    _CONVERTIBLE = frozenset(
+        (from_unit, to_unit)
+        for family_units in UNIT_FAMILIES.values()
+        for from_unit in family_units
+        for to_unit in family_units
+    )
+
+    # Unit -> family name, and family name -> base unit, for single-lookup family checks
+    _FAMILY_OF = {
+        unit: family_name
+        for family_name, family_units in UNIT_FAMILIES.items()
+        for unit in family_units
+    }
+    BASE_UNITS = {
+        'mass': 'kg',
+        'volume': 'L',
+        'count': 'each'
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        """Rebuild the family lookups so subclasses can extend UNIT_FAMILIES."""
+        super().__init_subclass__(**kwargs)
+        cls._CONVERTIBLE = frozenset(
+            (from_unit, to_unit)
+            for family_units in cls.UNIT_FAMILIES.values()
+            for from_unit in family_units
+            for to_unit in family_units
+        )
+        cls._FAMILY_OF = {
+            unit: family_name
+            for family_name, family_units in cls.UNIT_FAMILIES.items()
+            for unit in family_units
+        }
+
     def convert(self, value: float, from_unit: str, to_unit: str) -> float:
         """
         Convert a value from one unit to another.
@@ -73,26 +108,21 @@ class UnitConverter:
             >>> converter.convert(1.5, 'L', 'ml')
             1500.0
         """
-        # Normalize units (case-insensitive)
-        from_unit = from_unit.strip()
-        to_unit = to_unit.strip()
+        # Get conversion factor (a defined factor implies compatible units)
+        factor = self.CONVERSIONS.get((from_unit.strip(), to_unit.strip()))
 
-        # Check if conversion is possible
-        if not self.can_convert(from_unit, to_unit):
-            raise UnitConversionError(
-                f"Cannot convert from '{from_unit}' to '{to_unit}'. "
-                f"Units are not compatible."
-            )
-
-        # Get conversion factor
-        conversion_key = (from_unit, to_unit)
-
-        if conversion_key not in self.CONVERSIONS:
+        if factor is None:
+            from_unit = from_unit.strip()
+            to_unit = to_unit.strip()
+            if not self.can_convert(from_unit, to_unit):
+                raise UnitConversionError(
+                    f"Cannot convert from '{from_unit}' to '{to_unit}'. "
+                    f"Units are not compatible."
+                )
             raise UnitConversionError(
                 f"No conversion defined for {from_unit} → {to_unit}"
             )
 
-        factor = self.CONVERSIONS[conversion_key]
         return value * factor
 
     def can_convert(self, from_unit: str, to_unit: str) -> bool:
@@ -114,11 +144,7 @@ class UnitConverter:
             return True
 
         # Check if both units are in the same family
-        for family_units in self.UNIT_FAMILIES.values():
-            if from_unit in family_units and to_unit in family_units:
-                return True
-
-        return False
+        return (from_unit, to_unit) in self._CONVERTIBLE
 
     def get_unit_family(self, unit: str) -> str:
         """
@@ -135,11 +161,10 @@ class UnitConverter:
         """
         unit = unit.strip()
 
-        for family_name, family_units in self.UNIT_FAMILIES.items():
-            if unit in family_units:
-                return family_name
-
-        raise ValueError(f"Unknown unit: {unit}")
+        try:
+            return self._FAMILY_OF[unit]
+        except KeyError:
+            raise ValueError(f"Unknown unit: {unit}") from None
 
     def normalize_to_base_unit(self, value: float, unit: str) -> tuple[float, str]:
         """
@@ -152,15 +177,7 @@ class UnitConverter:
         Returns:
             (converted_value, base_unit)
         """
-        family = self.get_unit_family(unit)
-
-        base_units = {
-            'mass': 'kg',
-            'volume': 'L',
-            'count': 'each'
-        }
-
-        base_unit = base_units[family]
+        base_unit = self.BASE_UNITS[self.get_unit_family(unit)]
         converted_value = self.convert(value, unit, base_unit)
 
         return converted_value, base_unit
@@ -3,16 +3,27 @@
 Full implementation based on documentation/03_BOM_API_Tool.md
 Provides typed interface to the FastAPI pricing service.
 """
+import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Literal
 
 import httpx
 from pydantic import BaseModel, Field, validator
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup, installed with the "fast-json" extra
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Keep connections alive between calls so batches of estimates reuse them
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
 
 # ============================================================================
 # Data Models
@@ -25,6 +36,10 @@ class JobType(str, Enum):
     PASTRY_BOX = "pastry_box"
 
 
+# Fallback for validation when the API cannot be reached
+_KNOWN_JOB_TYPES = frozenset(t.value for t in JobType)
+
+
 class Material(BaseModel):
     """Material requirement"""
     name: str
@@ -54,9 +69,24 @@ class EstimateResponse(BaseModel):
     materials: list[Material]
     labor_hours: float = Field(ge=0)
 
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Material names as a column, aligned with units and qtys"""
+        return tuple(m.name for m in self.materials)
+
+    @property
+    def units(self) -> tuple[str, ...]:
+        """Material units as a column, aligned with names and qtys"""
+        return tuple(m.unit for m in self.materials)
+
+    @property
+    def qtys(self) -> tuple[float, ...]:
+        """Material quantities as a column, aligned with names and units"""
+        return tuple(m.qty for m in self.materials)
+
     def get_material_names(self) -> list[str]:
         """Get list of material names"""
-        return [m.name for m in self.materials]
+        return list(self.names)
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -94,11 +124,15 @@ class InvalidJobTypeError(BOMAPIError):
 class BOMAPITool:
     """Client for Bakery Pricing/BOM API"""
 
+    # Job types rarely change; reuse a fetched list for this many seconds
+    JOB_TYPES_TTL = 600.0
+
     def __init__(
         self,
         base_url: str = "http://localhost:8000",
         timeout: float = 10.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        verify: bool = True
     ):
         """
         Initialize BOM API client.
@@ -107,14 +141,17 @@ class BOMAPITool:
             base_url: Base URL of the API
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            verify: Check the API is reachable before returning
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
         self._client: httpx.Client | None = None
+        self._job_types_cache: tuple[float, list[str], frozenset[str]] | None = None
 
         # Verify connection on init
-        self._verify_connection()
+        if verify:
+            self._verify_connection()
 
     def _get_client(self) -> httpx.Client:
         """Get or create HTTP client"""
@@ -122,6 +159,7 @@ class BOMAPITool:
             self._client = httpx.Client(
                 base_url=self.base_url,
                 timeout=self.timeout,
+                limits=_POOL_LIMITS,
                 follow_redirects=True
             )
         return self._client
@@ -150,6 +188,7 @@ class BOMAPITool:
 
             data = response.json()
             if isinstance(data, list) and len(data) > 0:
+                self._cache_job_types(data)
                 logger.info(f"Connected to BOM API at {self.base_url}")
             else:
                 logger.warning(f"Unexpected job-types response: {data}")
@@ -179,6 +218,9 @@ class BOMAPITool:
     def get_job_types(self) -> list[str]:
         """
         Get list of available job types.
+
+        The list is cached for JOB_TYPES_TTL seconds; call
+        clear_job_types_cache() to force a refetch.
         
         Returns:
             List of job type strings
@@ -186,17 +228,38 @@ class BOMAPITool:
         Raises:
             APIConnectionError: If cannot connect to API
         """
+        cached = self._job_types_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return list(cached[1])
+
         try:
             response = self._get_client().get("/job-types")
             response.raise_for_status()
 
             job_types = response.json()
             logger.debug(f"Available job types: {job_types}")
-            return job_types
+            self._cache_job_types(job_types)
+            return list(job_types)
 
         except httpx.HTTPError as e:
             raise APIConnectionError(f"Failed to get job types: {e}") from e
 
+    def _cache_job_types(self, job_types: list[str]):
+        """
+        Remember job types (and a lower-cased set for lookups) until JOB_TYPES_TTL expires.
+        
+        Non-string entries in the API payload are left out of the lookup set.
+        """
+        self._job_types_cache = (
+            time.monotonic() + self.JOB_TYPES_TTL,
+            job_types,
+            frozenset(t.lower() for t in job_types if isinstance(t, str)),
+        )
+
+    def clear_job_types_cache(self):
+        """Forget cached job types so the next lookup hits the API"""
+        self._job_types_cache = None
+
     def estimate(
         self,
         job_type: str,
@@ -244,7 +307,7 @@ class BOMAPITool:
             response.raise_for_status()
 
             # Parse response
-            data = response.json()
+            data = _json_loads(response.content)
             estimate = EstimateResponse(**data)
 
             logger.info(
@@ -300,33 +363,91 @@ class BOMAPITool:
 
     def estimate_multiple(
         self,
-        estimates: list[tuple]
+        estimates: list[tuple],
+        max_workers: int = 8
     ) -> list[EstimateResponse]:
         """
         Get multiple estimates (useful for comparing options).
+
+        Estimates are independent, so they are requested concurrently over
+        the shared connection pool.
         
         Args:
             estimates: List of (job_type, quantity) tuples
+            max_workers: Maximum number of requests in flight at once
             
         Returns:
-            List of EstimateResponse objects
+            List of EstimateResponse objects, in request order. Failed
+            estimates are logged and left out.
         """
-        results = []
-        errors = []
+        if not estimates:
+            return []
 
-        for job_type, quantity in estimates:
+        def fetch(request: tuple) -> EstimateResponse | None:
+            job_type, quantity = request
             try:
-                result = self.estimate(job_type, quantity)
-                results.append(result)
+                return self.estimate(job_type, quantity)
             except Exception as e:
-                errors.append((job_type, quantity, str(e)))
                 logger.error(f"Failed to get estimate for {job_type} × {quantity}: {e}")
+                return None
+
+        # Create the client up front so worker threads share one pool
+        self._get_client()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(estimates))) as pool:
+            outcomes = list(pool.map(fetch, estimates))
 
-        if errors:
-            logger.warning(f"Failed {len(errors)} out of {len(estimates)} estimates")
+        results = [r for r in outcomes if r is not None]
+        if len(results) < len(estimates):
+            logger.warning(f"Failed {len(estimates) - len(results)} out of {len(estimates)} estimates")
 
         return results
 
+    def estimate_batch(
+        self,
+        estimates: list[tuple]
+    ) -> list[EstimateResponse]:
+        """
+        Get several estimates in a single request to POST /estimate/batch.
+        
+        Args:
+            estimates: List of (job_type, quantity) tuples
+            
+        Returns:
+            List of EstimateResponse objects, in request order
+            
+        Raises:
+            InvalidJobTypeError: If any job type is not valid
+            APIConnectionError: If cannot connect to API
+            ValueError: If any quantity is invalid
+        """
+        if not estimates:
+            return []
+
+        request_data = []
+        for job_type, quantity in estimates:
+            if quantity <= 0:
+                raise ValueError(f"Quantity must be positive, got {quantity}")
+            request_data.append({
+                "job_type": job_type.lower().replace(' ', '_'),
+                "quantity": quantity
+            })
+
+        try:
+            response = self._get_client().post("/estimate/batch", json=request_data)
+
+            if response.status_code == 400:
+                error_detail = response.json().get('detail', 'Unknown error')
+                raise InvalidJobTypeError(f"Invalid job type in batch: {error_detail}")
+
+            response.raise_for_status()
+
+            results = [EstimateResponse(**data) for data in _json_loads(response.content)]
+            logger.info(f"BOM batch estimate: {len(results)} jobs in one request")
+            return results
+
+        except httpx.HTTPError as e:
+            raise APIConnectionError(f"Batch estimate failed: {e}") from e
+
     # ========================================================================
     # Helper Methods
     # ========================================================================
@@ -385,8 +506,9 @@ class BOMAPITool:
             True if valid, False otherwise
         """
         try:
-            valid_types = self.get_job_types()
-            return job_type.lower() in [t.lower() for t in valid_types]
+            self.get_job_types()  # refreshes the cache if it has expired
+            valid_types = self._job_types_cache[2]
         except Exception:
             # If can't connect, check against known types
-            return job_type.lower() in ['cupcakes', 'cake', 'pastry_box']
+            valid_types = _KNOWN_JOB_TYPES
+        return job_type.lower() in valid_types
@@ -3,13 +3,48 @@
 Full implementation based on documentation/02_Database_Tool.md
 """
 import logging
+import re
 import sqlite3
+import string
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Read-side tuning applied to every connection (durability settings are left alone)
+_CONNECTION_PRAGMAS = (
+    "temp_store=MEMORY",
+    "cache_size=-16000",  # ~16 MB page cache, holds the whole materials table
+    "mmap_size=67108864",  # read pages through a 64 MB memory map instead of read() calls
+)
+
+# Prepared statements kept per connection; each distinct SQL string is one entry
+_CACHED_STATEMENTS = 256
+
+# SQL is kept as fixed strings so repeat calls hit the statement cache
+_SQL_TABLE_EXISTS = "SELECT name FROM sqlite_master WHERE type='table' AND name='materials'"
+_SQL_GET = "SELECT * FROM materials WHERE name = ? COLLATE NOCASE"
+_SQL_ALL = "SELECT * FROM materials ORDER BY name"
+# Filled with one placeholder per name, so each list length is its own cache entry
+_SQL_BULK = (
+    "SELECT name, unit, unit_cost, currency, last_updated FROM materials "
+    "WHERE LOWER(name) IN ({placeholders})"
+)
+_SQL_INSERT = (
+    "INSERT INTO materials (name, unit, unit_cost, currency, last_updated) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_COST = "UPDATE materials SET unit_cost = ?, last_updated = ? WHERE name = ?"
+_SQL_DELETE = "DELETE FROM materials WHERE name = ?"
+
+# SQLite's NOCASE, LOWER() and LIKE fold ASCII letters only; cached lookups fold the same way
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# Changes whenever another connection commits to the database file
+_SQL_DATA_VERSION = "PRAGMA data_version"
+
 
 # Custom Exceptions
 class DatabaseError(Exception):
@@ -29,9 +64,9 @@ class DatabaseConnectionError(DatabaseError):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MaterialCost:
-    """Material cost data from database"""
+    """Material cost data from database (immutable, so cached copies can be shared)"""
     name: str
     unit: str
     unit_cost: float
@@ -60,39 +95,102 @@ class MaterialCost:
         }
 
 
+def _name_keys(material_names: list[str]) -> tuple[str, ...]:
+    """Lower-cased (ASCII only), de-duplicated material names in first-seen order"""
+    return tuple(dict.fromkeys(name.translate(_ASCII_LOWER) for name in material_names))
+
+
+@lru_cache(maxsize=128)
+def _like_regex(pattern: str) -> re.Pattern[str]:
+    """
+    Regex equivalent of SQL ``LIKE '%pattern%'`` for ASCII lower-cased names.
+    
+    As in LIKE, ``%`` matches any run of characters and ``_`` any single one.
+    """
+    parts = {'%': '.*', '_': '.'}
+    return re.compile(
+        ''.join(parts.get(char) or re.escape(char) for char in pattern.translate(_ASCII_LOWER)),
+        re.DOTALL
+    )
+
+
 class DatabaseTool:
     """Interface to SQLite material costs database"""
 
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, cache: bool = True):
         """
         Initialize database connection.
         
         Args:
-            database_path: Path to SQLite database file
+            database_path: Path to SQLite database file, or a ``file:`` URI
+                (e.g. a shared in-memory database)
+            cache: Serve reads from an in-memory copy of the materials table.
+                The copy is reloaded after writes through this tool and, via
+                PRAGMA data_version, after commits by other connections or
+                processes.
         """
         self.database_path = database_path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self._cache_enabled = cache
+        # (materials ordered by name, their ASCII lower-cased names, lookup by that key),
+        # see _all_materials()
+        self._snapshot: tuple[list[MaterialCost], list[str], dict[str, MaterialCost]] | None = None
+        self._snapshot_version: int | None = None
         self._verify_database()
         logger.info(f"DatabaseTool initialized with path: {database_path}")
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a database connection"""
+        conn = sqlite3.connect(
+            self.database_path,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+            uri=str(self.database_path).startswith("file:")
+        )
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row  # Access columns by name
+        """Context manager yielding the shared database connection"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                yield self._conn
+            except Exception:
+                # Don't leave a failed write's transaction open on the shared connection
+                self._conn.rollback()
+                raise
+
+    def close(self):
+        """Close database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
         try:
-            yield conn
-        finally:
-            conn.close()
+            self.close()
+        except Exception:
+            pass
 
     def _verify_database(self):
         """Verify database exists and has correct schema"""
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='materials'
-                """)
+                cursor.execute(_SQL_TABLE_EXISTS)
                 if not cursor.fetchone():
                     raise ValueError(f"Table 'materials' not found in {self.database_path}")
 
@@ -110,22 +208,53 @@ class DatabaseTool:
             material_name: Name of the material (e.g., 'flour')
             
         Returns:
-            MaterialCost object or None if not found
+            MaterialCost object or None if not found (cached results are
+            shared between callers)
+        """
+        if self._cache_enabled:
+            # Whole table is held in memory; one dict probe on the ASCII lower-cased name
+            material = self._all_materials()[2].get(material_name.translate(_ASCII_LOWER))
+        else:
+            with self._get_connection() as conn:
+                row = conn.execute(_SQL_GET, (material_name,)).fetchone()
+            material = MaterialCost.from_row(row) if row else None
+
+        if material is not None:
+            logger.debug(f"Found material: {material_name}")
+        else:
+            logger.warning(f"Material not found: {material_name}")
+        return material
+
+    def _invalidate(self):
+        """Drop the cached materials after a write through this tool"""
+        self._snapshot = None
+
+    def _all_materials(self) -> tuple[list[MaterialCost], list[str], dict[str, MaterialCost]]:
+        """
+        All materials ordered by name, with their lower-cased names and a
+        lookup keyed by lower-cased name. Only ASCII letters are folded, as
+        in SQLite's NOCASE collation, so cached and uncached lookups agree.
+        
+        Loaded with one query and kept until the database changes: writes
+        through this tool drop it, and commits from other connections are
+        detected with PRAGMA data_version (which ignores this connection's
+        own writes). Reloaded on every call when caching is disabled.
         """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM materials WHERE name = ? COLLATE NOCASE",
-                (material_name,)
-            )
-            row = cursor.fetchone()
-
-            if row:
-                logger.debug(f"Found material: {material_name}")
-                return MaterialCost.from_row(row)
-            else:
-                logger.warning(f"Material not found: {material_name}")
-                return None
+            snapshot = self._snapshot
+            if snapshot is not None:
+                version = conn.execute(_SQL_DATA_VERSION).fetchone()[0]
+                if version != self._snapshot_version:
+                    snapshot = None
+            if snapshot is None:
+                rows = conn.execute(_SQL_ALL).fetchall()
+                materials = [MaterialCost.from_row(row) for row in rows]
+                names = [m.name.translate(_ASCII_LOWER) for m in materials]
+                snapshot = (materials, names, dict(zip(names, materials, strict=True)))
+                if self._cache_enabled:
+                    self._snapshot = snapshot
+                    self._snapshot_version = conn.execute(_SQL_DATA_VERSION).fetchone()[0]
+            return snapshot
 
     def get_material_cost_strict(self, material_name: str) -> MaterialCost:
         """
@@ -158,37 +287,26 @@ class DatabaseTool:
         if not material_names:
             return {}
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Use parameterized query with IN clause and LOWER() for case-insensitive matching
-            placeholders = ','.join('?' * len(material_names))
-            query = f"""
-                SELECT * FROM materials 
-                WHERE LOWER(name) IN ({placeholders})
-            """
+        keys = _name_keys(material_names)
 
-            # Convert material names to lowercase for comparison
-            lowercase_names = [name.lower() for name in material_names]
-            cursor.execute(query, lowercase_names)
-            rows = cursor.fetchall()
+        # Rows already carry exactly the MaterialCost fields, so copy them straight to dicts
+        results = {row['name']: dict(row) for row in self._select_by_names(keys)}
 
-            # Build result dictionary (convert to dict for compatibility)
-            results = {
-                row['name']: MaterialCost.from_row(row).to_dict()
-                for row in rows
-            }
+        # Log missing materials
+        missing = set(keys).difference(name.translate(_ASCII_LOWER) for name in results)
 
-            # Log missing materials
-            found = set(results.keys())
-            requested = set(material_names)
-            missing = requested - found
+        if missing:
+            logger.warning(f"Missing materials: {missing}")
 
-            if missing:
-                logger.warning(f"Missing materials: {missing}")
+        logger.info(f"Retrieved {len(results)}/{len(material_names)} materials")
+        return results
 
-            logger.info(f"Retrieved {len(results)}/{len(material_names)} materials")
-            return results
+    def _select_by_names(self, keys: tuple[str, ...]) -> list[sqlite3.Row]:
+        """Fetch the rows for several materials in one query (keys from _name_keys)"""
+        with self._get_connection() as conn:
+            # One parameterized query with IN clause and LOWER() for case-insensitive matching
+            query = _SQL_BULK.format(placeholders=','.join('?' * len(keys)))
+            return conn.execute(query, keys).fetchall()
 
     def get_materials_bulk_objects(self, material_names: list[str]) -> dict[str, MaterialCost]:
         """
@@ -203,62 +321,44 @@ class DatabaseTool:
         if not material_names:
             return {}
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            placeholders = ','.join('?' * len(material_names))
-            query = f"""
-                SELECT * FROM materials 
-                WHERE name IN ({placeholders}) COLLATE NOCASE
-            """
-
-            cursor.execute(query, material_names)
-            rows = cursor.fetchall()
-
-            results = {
-                row['name']: MaterialCost.from_row(row)
-                for row in rows
-            }
-
-            return results
+        return {
+            row['name']: MaterialCost.from_row(row)
+            for row in self._select_by_names(_name_keys(material_names))
+        }
 
     def list_all_materials(self) -> list[MaterialCost]:
         """
         Get all materials from database.
         
         Returns:
-            List of all MaterialCost objects
+            List of all MaterialCost objects, ordered by name
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM materials ORDER BY name")
-            rows = cursor.fetchall()
-
-            materials = [MaterialCost.from_row(row) for row in rows]
-            logger.info(f"Retrieved {len(materials)} materials")
-            return materials
+        materials = list(self._all_materials()[0])
+        logger.info(f"Retrieved {len(materials)} materials")
+        return materials
 
     def search_materials(self, pattern: str) -> list[MaterialCost]:
         """
         Search materials by name pattern.
         
+        Matches like SQL ``name LIKE '%pattern%'``, ignoring case, against
+        the in-memory material list rather than a query per search.
+        
         Args:
-            pattern: Search pattern (will be wrapped with % for LIKE)
+            pattern: Text to look for anywhere in the name (``%`` and ``_``
+                are LIKE wildcards)
             
         Returns:
-            List of matching MaterialCost objects
+            List of matching MaterialCost objects, ordered by name
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM materials WHERE name LIKE ? COLLATE NOCASE ORDER BY name",
-                (f"%{pattern}%",)
-            )
-            rows = cursor.fetchall()
-
-            materials = [MaterialCost.from_row(row) for row in rows]
-            logger.debug(f"Found {len(materials)} materials matching '{pattern}'")
-            return materials
+        materials, names, _ = self._all_materials()
+        regex = _like_regex(pattern)
+        matches = [
+            material for material, name in zip(materials, names, strict=True)
+            if regex.search(name)
+        ]
+        logger.debug(f"Found {len(matches)} materials matching '{pattern}'")
+        return matches
 
     # Validation & Helper Methods
 
@@ -272,6 +372,8 @@ class DatabaseTool:
         Returns:
             True if material exists, False otherwise
         """
+        if self._cache_enabled:
+            return material_name.translate(_ASCII_LOWER) in self._all_materials()[2]
         return self.get_material_cost(material_name) is not None
 
     def get_available_units(self) -> list[str]:
@@ -281,18 +383,11 @@ class DatabaseTool:
         Returns:
             List of unique unit strings
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT unit FROM materials ORDER BY unit")
-            rows = cursor.fetchall()
-            return [row['unit'] for row in rows]
+        return sorted({m.unit for m in self._all_materials()[0]})
 
     def get_material_count(self) -> int:
         """Get total number of materials in database"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as count FROM materials")
-            return cursor.fetchone()['count']
+        return len(self._all_materials()[0])
 
     def get_database_info(self) -> dict:
         """
@@ -301,32 +396,15 @@ class DatabaseTool:
         Returns:
             Dictionary with database statistics
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        materials = self._all_materials()[0]
 
-            # Total materials
-            cursor.execute("SELECT COUNT(*) as count FROM materials")
-            total = cursor.fetchone()['count']
-
-            # Units
-            cursor.execute("SELECT DISTINCT unit FROM materials")
-            units = [row['unit'] for row in cursor.fetchall()]
-
-            # Currencies
-            cursor.execute("SELECT DISTINCT currency FROM materials")
-            currencies = [row['currency'] for row in cursor.fetchall()]
-
-            # Last updated
-            cursor.execute("SELECT MAX(last_updated) as latest FROM materials")
-            latest = cursor.fetchone()['latest']
-
-            return {
-                'total_materials': total,
-                'units': units,
-                'currencies': currencies,
-                'last_updated': latest,
-                'path': self.database_path
-            }
+        return {
+            'total_materials': len(materials),
+            'units': sorted({m.unit for m in materials}),
+            'currencies': sorted({m.currency for m in materials}),
+            'last_updated': max((m.last_updated for m in materials), default=None),
+            'path': self.database_path
+        }
 
     # Administrative Functions
 
@@ -357,14 +435,9 @@ class DatabaseTool:
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO materials (name, unit, unit_cost, currency, last_updated)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (name, unit, unit_cost, currency, last_updated)
-                )
+                cursor.execute(_SQL_INSERT, (name, unit, unit_cost, currency, last_updated))
                 conn.commit()
+                self._invalidate()
                 logger.info(f"Added material: {name}")
                 return True
         except sqlite3.IntegrityError:
@@ -393,15 +466,9 @@ class DatabaseTool:
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE materials 
-                SET unit_cost = ?, last_updated = ?
-                WHERE name = ?
-                """,
-                (unit_cost, last_updated, name)
-            )
+            cursor.execute(_SQL_UPDATE_COST, (unit_cost, last_updated, name))
             conn.commit()
+            self._invalidate()
 
             if cursor.rowcount > 0:
                 logger.info(f"Updated material cost: {name} = {unit_cost}")
@@ -422,8 +489,9 @@ class DatabaseTool:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM materials WHERE name = ?", (name,))
+            cursor.execute(_SQL_DELETE, (name,))
             conn.commit()
+            self._invalidate()
 
             if cursor.rowcount > 0:
                 logger.info(f"Deleted material: {name}")
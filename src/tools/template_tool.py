@@ -4,14 +4,48 @@ Full implementation based on documentation/04_Template_Renderer_Tool.md
 Handles template loading, variable substitution, and file output.
 """
 import logging
-from datetime import datetime, timedelta
+import os
+import re
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import chevron
+from chevron.tokenizer import tokenize
 
 logger = logging.getLogger(__name__)
 
+# Matches simple variable tags such as {{quote_id}} or {{ total }}
+_PLACEHOLDER_RE = re.compile(r'\{\{\s*([a-zA-Z_]\w*)\s*\}\}')
+
+# Chevron tags that look a key up in the data
+_LOOKUP_TAGS = frozenset({'variable', 'no escape', 'section', 'inverted section'})
+
+# Placeholders every quotation template must contain
+_REQUIRED_PLACEHOLDERS = (
+    'company_name', 'quote_id', 'customer_name',
+    'job_type', 'quantity', 'total', 'currency'
+)
+
+# Value types _format_data() converts to display strings
+_NUMERIC_TYPES = frozenset({int, float})
+
+# Fields render() needs in the data dictionary
+_RENDER_REQUIRED = frozenset({
+    'company_name', 'quote_id', 'quote_date', 'customer_name',
+    'job_type', 'quantity', 'due_date', 'lines', 'currency', 'total'
+})
+
+# Fields QuoteDataBuilder.build() needs before returning
+_BUILDER_REQUIRED = frozenset({
+    'quote_id', 'company_name', 'customer_name',
+    'job_type', 'quantity', 'total', 'currency'
+})
+
 
 # ============================================================================
 # Exceptions
@@ -22,6 +56,268 @@ class TemplateRenderError(Exception):
     pass
 
 
+# ============================================================================
+# Formatting Helpers
+# ============================================================================
+
+def _fmt2(value: float) -> str:
+    """Format a number to 2 decimal places"""
+    return f"{value:.2f}"
+
+
+def _fmt2_if_numeric(value: Any) -> Any:
+    """Format numbers to 2 decimal places, passing other values (e.g. text) through"""
+    return _fmt2(value) if type(value) in _NUMERIC_TYPES else value
+
+
+def _fmt_pct(value: float) -> str:
+    """Format a whole-number percentage such as 30 as '30%'"""
+    return f"{value:.0f}%"
+
+
+# Display formatter for each numeric top-level field, applied by _format_data()
+_FIELD_FORMATTERS = {
+    **dict.fromkeys((
+        'unit_cost', 'line_cost', 'materials_subtotal', 'labor_cost', 'subtotal',
+        'markup_value', 'price_before_vat', 'vat_value', 'total', 'labor_hours'
+    ), _fmt2),
+    'markup_pct': _fmt_pct,
+    'vat_pct': _fmt_pct,
+}
+
+
+@lru_cache(maxsize=256)
+def _valid_until(quote_date: str, valid_days: int) -> str:
+    """Expiry date of a quote issued on quote_date (memoized, dates repeat)"""
+    return (date.fromisoformat(quote_date) + timedelta(days=valid_days)).isoformat()
+
+
+# ============================================================================
+# Compiled Rendering
+# ============================================================================
+
+_MISSING = object()
+
+
+class _Unsupported(Exception):
+    """Raised when compiled rendering must defer to chevron"""
+
+
+def _compile_tokens(tokens: tuple[tuple[str, str], ...]) -> list[tuple] | None:
+    """
+    Compile chevron tokens into a nested render program.
+    
+    Supports literals, variables and (inverted) sections at any depth.
+    Adjacent literals are merged so each run of text is a single op.
+    Returns None when the template uses anything else, in which case
+    rendering falls back to chevron.
+    """
+    program = []
+    stack = [(None, program)]
+    for tag, key in tokens:
+        if tag in ('comment', 'set delimiter'):
+            continue
+        if tag != 'literal' and '.' in key:
+            return None
+
+        body = stack[-1][1]
+        if tag == 'literal' and body and body[-1][0] == 'literal':
+            # Fold text split by comments or delimiter changes into one segment
+            body[-1] = ('literal', body[-1][1] + key, None)
+        elif tag in ('literal', 'variable', 'no escape'):
+            body.append((tag, key, None))
+        elif tag in ('section', 'inverted section'):
+            section_body = []
+            body.append((tag, key, section_body))
+            stack.append((key, section_body))
+        elif tag == 'end' and stack[-1][0] == key:
+            stack.pop()
+        else:
+            return None
+
+    return program if len(stack) == 1 else None
+
+
+def _lookup(key: str, scopes: list[Any]) -> Any:
+    """Resolve a key through the scope stack the way chevron does"""
+    for scope in scopes:
+        try:
+            value = scope[key]
+        except (TypeError, AttributeError):
+            value = getattr(scope, key, _MISSING)
+            if value is _MISSING:
+                continue
+        except (KeyError, IndexError):
+            continue
+
+        if value in (0, False) or getattr(value, '_CHEVRON_return_scope_when_falsy', False):
+            return value
+        return value or ''
+    return ''
+
+
+def _escape(text: str) -> str:
+    """HTML escape text exactly like chevron"""
+    return (text.replace('&', '&amp;').replace('"', '&quot;')
+            .replace('<', '&lt;').replace('>', '&gt;'))
+
+
+def _render_ops(ops: list[tuple], scopes: list[Any]) -> str:
+    """Render a compiled program against a scope stack"""
+    parts = [None] * len(ops)
+    for i, (tag, key, body) in enumerate(ops):
+        if tag == 'literal':
+            parts[i] = key
+        elif tag == 'variable':
+            parts[i] = _escape(str(_lookup(key, scopes)))
+        elif tag == 'no escape':
+            parts[i] = str(_lookup(key, scopes))
+        elif tag == 'inverted section':
+            parts[i] = '' if _lookup(key, scopes) else _render_ops(body, scopes)
+        else:
+            value = _lookup(key, scopes)
+            if not value:
+                parts[i] = ''
+            elif callable(value):
+                raise _Unsupported
+            elif isinstance(value, (Sequence, Iterator)) and not isinstance(value, str):
+                parts[i] = ''.join([_render_ops(body, [item] + scopes) for item in value if item])
+            else:
+                parts[i] = _render_ops(body, [value] + scopes)
+    return ''.join(parts)
+
+
+def _tag_keys(tokens: tuple[tuple[str, str], ...] | None) -> frozenset[str] | None:
+    """
+    Top-level data keys looked up by a template's tags.
+    
+    Taken from chevron's tokens, so custom delimiters and any key syntax
+    chevron accepts are covered. Returns None when the keys cannot be
+    known (tokenizing failed or the template uses partials).
+    """
+    if tokens is None:
+        return None
+    keys = set()
+    for tag, key in tokens:
+        if tag == 'partial':
+            return None
+        if tag in _LOOKUP_TAGS:
+            keys.add(key.split('.', 1)[0])
+    return frozenset(keys)
+
+
+@dataclass(frozen=True, slots=True)
+class _ParsedTemplate:
+    """Everything TemplateTool derives from a template file's text"""
+    template: str
+    tokens: tuple | None
+    program: list[tuple] | None
+    placeholders: frozenset[str]
+    template_keys: frozenset[str] | None
+
+
+@lru_cache(maxsize=128)
+def _load_parsed(path: str, mtime_ns: int) -> _ParsedTemplate:
+    """
+    Read, tokenize, compile and scan a template file.
+    
+    Cached on (path, mtime) so instances sharing a template reuse the
+    parsed form, while edits to the file are still picked up.
+    """
+    template = Path(path).read_text(encoding='utf-8')
+    try:
+        tokens = tuple(tokenize(template))
+        program = _compile_tokens(tokens)
+    except chevron.ChevronError:
+        # Left to chevron.render so the error surfaces at render time
+        tokens = program = None
+
+    return _ParsedTemplate(
+        template,
+        tokens,
+        program,
+        frozenset(_PLACEHOLDER_RE.findall(template)),
+        _tag_keys(tokens),
+    )
+
+
+# ============================================================================
+# Line Items
+# ============================================================================
+
+class LineItem:
+    """Material line for template rendering"""
+
+    __slots__ = ('name', 'qty', 'unit', 'unit_cost', 'line_cost')
+
+    def __init__(self, name: str, qty: float, unit: str, unit_cost: float, line_cost: float):
+        self.name = name
+        self.qty = qty
+        self.unit = unit
+        self.unit_cost = unit_cost
+        self.line_cost = line_cost
+
+    @classmethod
+    def from_dict(cls, line: dict[str, Any]) -> 'LineItem':
+        """Create line item from a material line dictionary"""
+        return cls(line['name'], line['qty'], line['unit'], line['unit_cost'], line['line_cost'])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a material line dictionary"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __getitem__(self, key: str) -> Any:
+        """Allow dictionary-style access so callers can treat lines uniformly"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+# ============================================================================
+# Quote Data
+# ============================================================================
+
+@dataclass(slots=True)
+class QuoteData:
+    """Complete template data for one quotation, built in a single call"""
+    quote_id: str
+    quote_date: str
+    valid_until: str
+    company_name: str
+    customer_name: str
+    job_type: str
+    quantity: int
+    due_date: str
+    lines: list[LineItem]
+    labor_hours: float
+    labor_rate: float
+    labor_cost: float
+    materials_subtotal: float
+    subtotal: float
+    markup_pct: float
+    markup_value: float
+    price_before_vat: float
+    vat_pct: float
+    vat_value: float
+    total: float
+    currency: str = "GBP"
+    notes: str = ""
+
+    def __post_init__(self):
+        self.lines = [
+            LineItem.from_dict(line) if isinstance(line, dict) else line
+            for line in self.lines
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to template data dictionary (lines are shared, not copied)"""
+        return {name: getattr(self, name) for name in _QUOTE_DATA_FIELDS}
+
+
+_QUOTE_DATA_FIELDS = tuple(field.name for field in fields(QuoteData))
+
+
 # ============================================================================
 # Template Tool
 # ============================================================================
@@ -50,16 +346,23 @@ class TemplateTool:
 
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Load template
-        self.template = self._load_template()
+        # save() builds output paths by plain string concatenation
+        self._output_prefix = str(self.output_dir) + os.sep
+
+        # Load template (parsed and scanned once per file version, shared across instances)
+        parsed = self._load_template()
+        self.template = parsed.template
+        self._tokens = parsed.tokens
+        self._program = parsed.program
+        self._placeholders = parsed.placeholders
+        self._template_keys = parsed.template_keys
         logger.info(f"Template loaded: {self.template_path}")
 
-    def _load_template(self) -> str:
-        """Load template content"""
+    def _load_template(self) -> _ParsedTemplate:
+        """Load template content with its chevron tokens, compiled program and tag keys"""
         try:
-            with open(self.template_path, encoding='utf-8') as f:
-                return f.read()
+            path = str(self.template_path.resolve())
+            return _load_parsed(path, os.stat(path).st_mtime_ns)
         except Exception as e:
             raise TemplateRenderError(f"Cannot load template: {e}") from e
 
@@ -87,8 +390,13 @@ class TemplateTool:
             # Format data for template
             formatted_data = self._format_data(data)
 
-            # Render with chevron
-            rendered = chevron.render(self.template, formatted_data)
+            # Render with the compiled program, falling back to chevron
+            try:
+                if self._program is None:
+                    raise _Unsupported
+                rendered = _render_ops(self._program, [formatted_data])
+            except _Unsupported:
+                rendered = chevron.render(self._tokens or self.template, formatted_data)
 
             logger.info("Template rendered successfully")
             return rendered
@@ -98,59 +406,54 @@ class TemplateTool:
 
     def _validate_data(self, data: dict[str, Any]):
         """Validate required fields are present"""
-        required_fields = [
-            'company_name', 'quote_id', 'quote_date', 'customer_name',
-            'job_type', 'quantity', 'due_date', 'lines', 'currency', 'total'
-        ]
-
-        missing = [field for field in required_fields if field not in data]
+        missing = _RENDER_REQUIRED - data.keys()
         if missing:
-            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+            raise ValueError(f"Missing required fields: {', '.join(sorted(missing))}")
 
     def _format_data(self, data: dict[str, Any]) -> dict[str, Any]:
         """
         Format data for template rendering.
         
-        Handles number formatting, percentage display, etc.
+        Handles number formatting, percentage display, etc. Only keys
+        referenced by the template are carried over (all keys when the
+        template's keys are unknown).
         """
-        formatted = data.copy()
-
-        # Format currency values to 2 decimal places
-        currency_fields = [
-            'unit_cost', 'line_cost', 'materials_subtotal', 'labor_cost',
-            'subtotal', 'markup_value', 'price_before_vat', 'vat_value', 'total'
-        ]
-
-        for field in currency_fields:
-            if field in formatted and isinstance(formatted[field], (int, float)):
-                formatted[field] = f"{formatted[field]:.2f}"
+        keys = data.keys() if self._template_keys is None else self._template_keys
+        formatted = {}
+        for key in keys:
+            if key not in data:
+                continue
+            value = data[key]
+            formatter = _FIELD_FORMATTERS.get(key)
+            if formatter is not None and type(value) in _NUMERIC_TYPES:
+                value = formatter(value)
+            formatted[key] = value
 
         # Format lines
         if 'lines' in formatted:
-            formatted['lines'] = [
-                {
-                    'name': line['name'],
-                    'qty': f"{line['qty']:.2f}" if isinstance(line['qty'], (int, float)) else line['qty'],
-                    'unit': line['unit'],
-                    'unit_cost': f"{line['unit_cost']:.2f}" if isinstance(line['unit_cost'], (int, float)) else line['unit_cost'],
-                    'line_cost': f"{line['line_cost']:.2f}" if isinstance(line['line_cost'], (int, float)) else line['line_cost']
-                }
-                for line in formatted['lines']
-            ]
-
-        # Format labor hours
-        if 'labor_hours' in formatted and isinstance(formatted['labor_hours'], (int, float)):
-            formatted['labor_hours'] = f"{formatted['labor_hours']:.2f}"
-
-        # Format percentages
-        if 'markup_pct' in formatted and isinstance(formatted['markup_pct'], (int, float)):
-            formatted['markup_pct'] = f"{formatted['markup_pct']:.0f}%"
-
-        if 'vat_pct' in formatted and isinstance(formatted['vat_pct'], (int, float)):
-            formatted['vat_pct'] = f"{formatted['vat_pct']:.0f}%"
+            formatted['lines'] = [self._format_line(line) for line in formatted['lines']]
 
         return formatted
 
+    @staticmethod
+    def _format_line(line: LineItem | dict[str, Any]) -> LineItem | dict[str, Any]:
+        """Format a single material line for template rendering"""
+        if isinstance(line, LineItem):
+            return LineItem(
+                line.name,
+                _fmt2_if_numeric(line.qty),
+                line.unit,
+                _fmt2_if_numeric(line.unit_cost),
+                _fmt2_if_numeric(line.line_cost)
+            )
+
+        # Shallow copy so the caller's line is left untouched, then format in place
+        line = dict(line)
+        line['qty'] = _fmt2_if_numeric(line['qty'])
+        line['unit_cost'] = _fmt2_if_numeric(line['unit_cost'])
+        line['line_cost'] = _fmt2_if_numeric(line['line_cost'])
+        return line
+
     # ========================================================================
     # File Operations
     # ========================================================================
@@ -166,19 +469,48 @@ class TemplateTool:
         Returns:
             Path to saved file
         """
-        filename = f"quote_{quote_id}.md"
-        output_path = self.output_dir / filename
+        # Plain string path for the syscalls; a Path is built once for the caller
+        output_path = f"{self._output_prefix}quote_{quote_id}.md"
 
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Single encode and raw writes, bypassing the text I/O stack
+            data = memoryview(content.encode('utf-8'))
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
 
             logger.info(f"Quote saved: {output_path}")
-            return output_path
+            return Path(output_path)
 
         except Exception as e:
             raise TemplateRenderError(f"Cannot save file: {e}") from e
 
+    def save_many(self, quotes: list[tuple[str, str]], max_workers: int = 8) -> list[Path]:
+        """
+        Save several rendered quotes concurrently.
+        
+        The writes are independent raw syscalls that release the GIL, so
+        they are spread over a thread pool.
+        
+        Args:
+            quotes: List of (content, quote_id) tuples
+            max_workers: Maximum number of files written at once
+            
+        Returns:
+            Paths to the saved files, in input order
+            
+        Raises:
+            TemplateRenderError: If any file cannot be written
+        """
+        if not quotes:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(quotes))) as pool:
+            return list(pool.map(lambda quote: self.save(*quote), quotes))
+
     def render_and_save(self, data: dict[str, Any]) -> Path:
         """
         Render template and save to file in one step.
@@ -208,18 +540,11 @@ class TemplateTool:
         Returns:
             List of missing placeholders
         """
-        required_placeholders = [
-            'company_name', 'quote_id', 'customer_name',
-            'job_type', 'quantity', 'total', 'currency'
+        return [
+            placeholder for placeholder in _REQUIRED_PLACEHOLDERS
+            if placeholder not in self._placeholders
         ]
 
-        missing = []
-        for placeholder in required_placeholders:
-            if f"{{{{{placeholder}}}}}" not in self.template:
-                missing.append(placeholder)
-
-        return missing
-
 
 # ============================================================================
 # Data Builder Helper
@@ -239,13 +564,20 @@ class QuoteDataBuilder:
         quote_date: str | None = None,
         valid_days: int = 30
     ) -> 'QuoteDataBuilder':
-        """Set header information"""
+        """
+        Set header information.
+        
+        valid_until counts from quote_date when it is YYYY-MM-DD (defaults
+        to today). Other date formats are kept as given, with validity
+        counted from today.
+        """
         if quote_date is None:
-            quote_date = datetime.now().strftime("%Y-%m-%d")
+            quote_date = date.today().isoformat()
 
-        valid_until = (
-            datetime.now() + timedelta(days=valid_days)
-        ).strftime("%Y-%m-%d")
+        try:
+            valid_until = _valid_until(quote_date, valid_days)
+        except ValueError:
+            valid_until = _valid_until(date.today().isoformat(), valid_days)
 
         self.data.update({
             'quote_id': quote_id,
@@ -275,7 +607,35 @@ class QuoteDataBuilder:
         lines: list[dict[str, Any]]
     ) -> 'QuoteDataBuilder':
         """Set material lines"""
-        self.data['lines'] = lines
+        self.data['lines'] = [LineItem.from_dict(line) for line in lines]
+        return self
+
+    def set_materials_columnar(
+        self,
+        names: Sequence[str],
+        units: Sequence[str],
+        qtys: Sequence[float],
+        unit_costs: Sequence[float],
+        line_costs: Sequence[float] | None = None
+    ) -> 'QuoteDataBuilder':
+        """
+        Set material lines from parallel columns, skipping per-line dicts.
+        
+        Line costs default to qty * unit_cost rounded to 2 decimals.
+        
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        if line_costs is None:
+            line_costs = [
+                round(qty * unit_cost, 2)
+                for qty, unit_cost in zip(qtys, unit_costs, strict=True)
+            ]
+        self.data['lines'] = [
+            LineItem(name, qty, unit, unit_cost, line_cost)
+            for name, unit, qty, unit_cost, line_cost
+            in zip(names, units, qtys, unit_costs, line_costs, strict=True)
+        ]
         return self
 
     def set_labor(
@@ -324,14 +684,16 @@ class QuoteDataBuilder:
         return self
 
     def build(self) -> dict[str, Any]:
-        """Build final data dictionary"""
-        required = [
-            'quote_id', 'company_name', 'customer_name',
-            'job_type', 'quantity', 'total', 'currency'
-        ]
-
-        missing = [f for f in required if f not in self.data]
-        if missing:
-            raise ValueError(f"Missing required fields: {missing}")
-
-        return self.data
+        """Build final data dictionary (material lines as plain dicts, JSON-serializable)"""
+        # Subset test allocates nothing; the missing set is only built to report an error
+        if not _BUILDER_REQUIRED <= self.data.keys():
+            missing = _BUILDER_REQUIRED - self.data.keys()
+            raise ValueError(f"Missing required fields: {sorted(missing)}")
+
+        data = dict(self.data)
+        if 'lines' in data:
+            data['lines'] = [
+                line.to_dict() if isinstance(line, LineItem) else line
+                for line in data['lines']
+            ]
+        return data
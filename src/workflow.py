@@ -0,0 +1,20 @@
+"""Quote workflow helpers shared by the API service and tests"""
+from typing import Any
+
+from .tools.bom_tool import EstimateResponse
+from .tools.database_tool import DatabaseTool
+
+
+def fetch_costs(db: DatabaseTool, bom_estimate: EstimateResponse) -> dict[str, dict[str, Any]]:
+    """
+    Fetch cost data for every material in a BOM estimate with a single query.
+
+    Args:
+        db: Database tool to query
+        bom_estimate: Estimate whose materials need pricing
+
+    Returns:
+        Dictionary mapping material name to cost data. Materials missing
+        from the database are omitted.
+    """
+    return db.get_materials_bulk(list(bom_estimate.names))
@@ -1,14 +1,38 @@
 """Pytest configuration and shared fixtures"""
+import shutil
 import sqlite3
 import sys
 import tempfile
+from decimal import Decimal
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Stub LangChain once per session so the orchestrator imports without it
+for _module in (
+    'langchain.agents',
+    'langchain.prompts',
+    'langchain.memory',
+    'langchain.tools',
+    'langchain_openai',
+):
+    sys.modules.setdefault(_module, MagicMock())
+
+from src.calculator import PricingCalculator  # noqa: E402
+from src.converter import UnitConverter  # noqa: E402
+
+# Let fixtures pass Decimal costs straight to sqlite3 (registered once per session)
+sqlite3.register_adapter(Decimal, float)
+
+_INSERT_SQL = (
+    "INSERT INTO materials (name, unit, unit_cost, currency, last_updated) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
 
 @pytest.fixture
 def temp_dir():
@@ -17,18 +41,17 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def temp_database():
-    """Create a temporary test database with sample data"""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
+@pytest.fixture(scope="session")
+def _materials_db_template(tmp_path_factory):
+    """Build the sample materials database once per test session"""
+    db_path = tmp_path_factory.mktemp("materials") / "template.db"
 
-    # Initialize schema and data
+    # Throwaway file: skip the rollback journal and fsyncs while seeding
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    conn.executescript("""
+        PRAGMA journal_mode=OFF;
+        PRAGMA synchronous=OFF;
 
-    # Create schema
-    cursor.execute("""
         CREATE TABLE materials (
             id INTEGER PRIMARY KEY,
             name TEXT UNIQUE NOT NULL,
@@ -36,33 +59,61 @@ def temp_database():
             unit_cost REAL NOT NULL,
             currency TEXT NOT NULL,
             last_updated TEXT NOT NULL
-        )
+        );
     """)
 
-    # Insert test data
-    cursor.executemany(
-        "INSERT INTO materials (name, unit, unit_cost, currency, last_updated) VALUES (?, ?, ?, ?, ?)",
-        [
-            ('flour', 'kg', 0.90, 'GBP', '2025-09-01'),
-            ('sugar', 'kg', 0.70, 'GBP', '2025-09-01'),
-            ('butter', 'kg', 4.50, 'GBP', '2025-09-01'),
-            ('eggs', 'each', 0.18, 'GBP', '2025-09-01'),
-            ('milk', 'L', 0.60, 'GBP', '2025-09-01'),
-            ('vanilla', 'ml', 0.05, 'GBP', '2025-09-01'),
-            ('baking_powder', 'kg', 3.00, 'GBP', '2025-09-01'),
-            ('cocoa', 'kg', 6.00, 'GBP', '2025-09-01'),
-            ('salt', 'kg', 0.40, 'GBP', '2025-09-01'),
-        ]
-    )
-
-    conn.commit()
+    # Insert test data in a single transaction
+    with conn:
+        conn.executemany(
+            _INSERT_SQL,
+            [
+                ('flour', 'kg', 0.90, 'GBP', '2025-09-01'),
+                ('sugar', 'kg', 0.70, 'GBP', '2025-09-01'),
+                ('butter', 'kg', 4.50, 'GBP', '2025-09-01'),
+                ('eggs', 'each', 0.18, 'GBP', '2025-09-01'),
+                ('milk', 'L', 0.60, 'GBP', '2025-09-01'),
+                ('vanilla', 'ml', 0.05, 'GBP', '2025-09-01'),
+                ('baking_powder', 'kg', 3.00, 'GBP', '2025-09-01'),
+                ('cocoa', 'kg', 6.00, 'GBP', '2025-09-01'),
+                ('salt', 'kg', 0.40, 'GBP', '2025-09-01'),
+            ]
+        )
     conn.close()
 
-    yield db_path
+    return db_path
+
+
+@pytest.fixture
+def temp_database(_materials_db_template, tmp_path):
+    """Create a temporary test database with sample data
+
+    Each test gets its own copy of the session template, so tests that
+    add, update or delete materials stay isolated.
+    """
+    db_path = tmp_path / "materials.db"
+    shutil.copyfile(_materials_db_template, db_path)
+
+    return str(db_path)
+
+
+@pytest.fixture(scope="session")
+def materials_database(_materials_db_template):
+    """Shared sample database for tests that only read material costs
+
+    Opened through a read-only file: URI, so a write fails instead of
+    changing the template every temp_database copy is made from. Tests
+    that write to the database must use temp_database.
+    """
+    return f"{_materials_db_template.as_uri()}?mode=ro"
+
+
+@pytest.fixture(scope="session")
+def calculator():
+    """Pricing calculator with the default bakery rates, shared per session"""
+    return PricingCalculator(labor_rate=15.0, markup_pct=0.30, vat_pct=0.20)
+
 
-    # Cleanup
-    import os
-    try:
-        os.unlink(db_path)
-    except:
-        pass
+@pytest.fixture(scope="session")
+def converter():
+    """Unit converter shared per session (it holds no per-call state)"""
+    return UnitConverter()
@@ -0,0 +1,91 @@
+"""In-process BOM API stub built on httpx.MockTransport"""
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+# Keep a handle on the real client; tests monkeypatch httpx.Client itself
+_HttpxClient = httpx.Client
+
+JOB_TYPES = ["cupcakes", "cake", "pastry_box"]
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def make_response(status: int, body: Any = None, method: str = "GET", url: str = "http://testserver") -> httpx.Response:
+    """
+    Build a real httpx.Response with a JSON body.
+
+    The response is bound to a request, so raise_for_status() works on it
+    outside a transport (e.g. as the return value of a mocked client).
+    """
+    return httpx.Response(status, json=body, request=httpx.Request(method, url))
+
+
+class BOMAPIStub:
+    """
+    Route table for a stub BOM API served through httpx.MockTransport.
+
+    Routes map (method, path) to a response to return, an exception to
+    raise from the transport, or a handler called with the request.
+    Unrouted requests get a 404, and every request is recorded in
+    ``calls``.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], httpx.Response | Exception | Handler] = {}
+        self.calls: list[httpx.Request] = []
+        self.transport = httpx.MockTransport(self._handle)
+
+    def respond(self, method: str, path: str, status: int = 200, json: Any = None) -> None:
+        """Answer method + path with the given status and JSON body"""
+        self.routes[(method, path)] = httpx.Response(status, json=json)
+
+    def fail(self, method: str, path: str, error: Exception) -> None:
+        """Raise error (e.g. httpx.ConnectError) for method + path"""
+        self.routes[(method, path)] = error
+
+    def handle(self, method: str, path: str, handler: Handler) -> None:
+        """Answer method + path by calling handler(request)"""
+        self.routes[(method, path)] = handler
+
+    def reset(self) -> None:
+        """Drop all routes and recorded calls"""
+        self.routes.clear()
+        self.calls.clear()
+
+    def client(self, **kwargs) -> httpx.Client:
+        """Build a real httpx.Client wired to the stub transport"""
+        return _HttpxClient(transport=self.transport, **kwargs)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        route = self.routes.get((request.method, request.url.path))
+        if route is None:
+            return httpx.Response(404, json={"detail": "Not Found"})
+        if isinstance(route, Exception):
+            raise route
+        if callable(route):
+            return route(request)
+        # Fresh response per request; the client takes ownership of it
+        return httpx.Response(route.status_code, headers=route.headers, content=route.content)
+
+
+def bom_client_factory(estimate: dict[str, Any]) -> Callable[..., httpx.Client]:
+    """
+    Build an httpx.Client factory backed by a stub BOM API.
+
+    The stub answers GET /job-types with JOB_TYPES and POST /estimate with
+    the given estimate payload, so the real client and JSON parsing run
+    without a server.
+
+    Args:
+        estimate: JSON body returned for every estimate request
+
+    Returns:
+        Callable accepting httpx.Client keyword arguments
+    """
+    stub = BOMAPIStub()
+    stub.respond("GET", "/job-types", json=JOB_TYPES)
+    stub.respond("POST", "/estimate", json=estimate)
+    return stub.client
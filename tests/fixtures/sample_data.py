@@ -1,6 +1,76 @@
 """Sample test data factory"""
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
+# Static fixture tables, built once at import
+
+# Per-job material columns: (names, units, qty per unit)
+_MATERIALS_PER_UNIT = {
+    'cupcakes': (
+        ('flour', 'sugar', 'butter', 'eggs', 'milk', 'vanilla', 'baking_powder'),
+        ('kg', 'kg', 'kg', 'each', 'L', 'ml', 'kg'),
+        (0.08, 0.06, 0.04, 0.5, 0.05, 1.0, 0.001),
+    ),
+    'cake': (
+        ('flour', 'sugar', 'butter', 'eggs', 'milk'),
+        ('kg', 'kg', 'kg', 'each', 'L'),
+        (0.50, 0.40, 0.30, 4.0, 0.25),
+    ),
+    'pastry_box': (
+        ('flour', 'butter', 'sugar'),
+        ('kg', 'kg', 'kg'),
+        (0.60, 0.40, 0.20),
+    ),
+}
+
+_LABOR_PER_UNIT = {
+    'cupcakes': 0.05,
+    'cake': 0.80,
+    'pastry_box': 0.60
+}
+
+_MATERIAL_COSTS = tuple(MappingProxyType(material) for material in (
+    {'name': 'flour', 'unit': 'kg', 'unit_cost': 0.90, 'currency': 'GBP'},
+    {'name': 'sugar', 'unit': 'kg', 'unit_cost': 0.70, 'currency': 'GBP'},
+    {'name': 'butter', 'unit': 'kg', 'unit_cost': 4.50, 'currency': 'GBP'},
+    {'name': 'eggs', 'unit': 'each', 'unit_cost': 0.18, 'currency': 'GBP'},
+    {'name': 'milk', 'unit': 'L', 'unit_cost': 0.60, 'currency': 'GBP'},
+    {'name': 'cocoa', 'unit': 'kg', 'unit_cost': 6.00, 'currency': 'GBP'},
+    {'name': 'vanilla', 'unit': 'ml', 'unit_cost': 0.05, 'currency': 'GBP'},
+    {'name': 'baking_powder', 'unit': 'kg', 'unit_cost': 3.00, 'currency': 'GBP'},
+    {'name': 'salt', 'unit': 'kg', 'unit_cost': 0.40, 'currency': 'GBP'},
+    {'name': 'yeast', 'unit': 'kg', 'unit_cost': 2.50, 'currency': 'GBP'},
+))
+
+
+# Same table as parallel columns: (names, units, unit_costs, currencies, last_updated)
+_MATERIAL_COSTS_SOA = (
+    tuple(material['name'] for material in _MATERIAL_COSTS),
+    tuple(material['unit'] for material in _MATERIAL_COSTS),
+    tuple(material['unit_cost'] for material in _MATERIAL_COSTS),
+    tuple(material['currency'] for material in _MATERIAL_COSTS),
+    ('2025-12-18',) * len(_MATERIAL_COSTS),
+)
+
+
+@lru_cache(maxsize=128)
+def _bom_estimate(job_type: str, quantity: int) -> Mapping[str, Any]:
+    """Build read-only BOM estimate data, memoized per (job_type, quantity)"""
+    names, units, qty_per_unit = _MATERIALS_PER_UNIT.get(job_type, ((), (), ()))
+    materials = tuple(
+        MappingProxyType({'name': name, 'unit': unit, 'qty': qty * quantity})
+        for name, unit, qty in zip(names, units, qty_per_unit, strict=True)
+    )
+
+    return MappingProxyType({
+        'job_type': job_type,
+        'quantity': quantity,
+        'materials': materials,
+        'labor_hours': _LABOR_PER_UNIT.get(job_type, 0) * quantity
+    })
+
 
 class TestDataFactory:
     """Factory for creating test data"""
@@ -9,69 +79,21 @@ class TestDataFactory:
     def create_bom_estimate(
         job_type: str = 'cupcakes',
         quantity: int = 24
-    ) -> dict[str, Any]:
-        """Create BOM estimate data"""
-        materials_per_unit = {
-            'cupcakes': [
-                {'name': 'flour', 'unit': 'kg', 'qty_per_unit': 0.08},
-                {'name': 'sugar', 'unit': 'kg', 'qty_per_unit': 0.06},
-                {'name': 'butter', 'unit': 'kg', 'qty_per_unit': 0.04},
-                {'name': 'eggs', 'unit': 'each', 'qty_per_unit': 0.5},
-                {'name': 'milk', 'unit': 'L', 'qty_per_unit': 0.05},
-                {'name': 'vanilla', 'unit': 'ml', 'qty_per_unit': 1.0},
-                {'name': 'baking_powder', 'unit': 'kg', 'qty_per_unit': 0.001},
-            ],
-            'cake': [
-                {'name': 'flour', 'unit': 'kg', 'qty_per_unit': 0.50},
-                {'name': 'sugar', 'unit': 'kg', 'qty_per_unit': 0.40},
-                {'name': 'butter', 'unit': 'kg', 'qty_per_unit': 0.30},
-                {'name': 'eggs', 'unit': 'each', 'qty_per_unit': 4.0},
-                {'name': 'milk', 'unit': 'L', 'qty_per_unit': 0.25},
-            ],
-            'pastry_box': [
-                {'name': 'flour', 'unit': 'kg', 'qty_per_unit': 0.60},
-                {'name': 'butter', 'unit': 'kg', 'qty_per_unit': 0.40},
-                {'name': 'sugar', 'unit': 'kg', 'qty_per_unit': 0.20},
-            ],
-        }
-
-        labor_per_unit = {
-            'cupcakes': 0.05,
-            'cake': 0.80,
-            'pastry_box': 0.60
-        }
-
-        materials = [
-            {
-                'name': m['name'],
-                'unit': m['unit'],
-                'qty': m['qty_per_unit'] * quantity
-            }
-            for m in materials_per_unit.get(job_type, [])
-        ]
+    ) -> Mapping[str, Any]:
+        """Create BOM estimate data (cached and read-only; copy to modify)"""
+        return _bom_estimate(job_type, quantity)
 
-        return {
-            'job_type': job_type,
-            'quantity': quantity,
-            'materials': materials,
-            'labor_hours': labor_per_unit.get(job_type, 0) * quantity
-        }
+    @staticmethod
+    def create_material_costs() -> tuple[Mapping[str, Any], ...]:
+        """Create sample material cost data (shared and read-only; copy to modify)"""
+        return _MATERIAL_COSTS
 
     @staticmethod
-    def create_material_costs() -> list[dict[str, Any]]:
-        """Create sample material cost data"""
-        return [
-            {'name': 'flour', 'unit': 'kg', 'unit_cost': 0.90, 'currency': 'GBP'},
-            {'name': 'sugar', 'unit': 'kg', 'unit_cost': 0.70, 'currency': 'GBP'},
-            {'name': 'butter', 'unit': 'kg', 'unit_cost': 4.50, 'currency': 'GBP'},
-            {'name': 'eggs', 'unit': 'each', 'unit_cost': 0.18, 'currency': 'GBP'},
-            {'name': 'milk', 'unit': 'L', 'unit_cost': 0.60, 'currency': 'GBP'},
-            {'name': 'cocoa', 'unit': 'kg', 'unit_cost': 6.00, 'currency': 'GBP'},
-            {'name': 'vanilla', 'unit': 'ml', 'unit_cost': 0.05, 'currency': 'GBP'},
-            {'name': 'baking_powder', 'unit': 'kg', 'unit_cost': 3.00, 'currency': 'GBP'},
-            {'name': 'salt', 'unit': 'kg', 'unit_cost': 0.40, 'currency': 'GBP'},
-            {'name': 'yeast', 'unit': 'kg', 'unit_cost': 2.50, 'currency': 'GBP'},
-        ]
+    def create_material_costs_soa() -> tuple[
+        tuple[str, ...], tuple[str, ...], tuple[float, ...], tuple[str, ...], tuple[str, ...]
+    ]:
+        """Create sample material cost data as (names, units, unit_costs, currencies, last_updated)"""
+        return _MATERIAL_COSTS_SOA
 
     @staticmethod
     def create_quote_data(
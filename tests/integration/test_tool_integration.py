@@ -1,24 +1,26 @@
 """Integration tests for tools working together"""
-import tempfile
-from pathlib import Path
+import os
+import sqlite3
+import uuid
 
 import pytest
 
-from src.calculator import PricingCalculator
-from src.converter import UnitConverter
-from src.tools.database_tool import DatabaseTool
+from src.calculator import LineInput, PricingCalculator
+from src.converter import UnitConversionError, UnitConverter
+from src.tools.database_tool import DatabaseTool, MaterialNotFoundError
 from tests.fixtures.sample_data import TestDataFactory
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def temp_database():
-    """Create temporary test database"""
-    import sqlite3
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False) as f:
-        db_path = f.name
-
-    conn = sqlite3.connect(db_path)
+    """Create shared in-memory test database for this module's read-only tests"""
+    # Named per xdist worker (and uniquely) so parallel sessions never share it
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+    db_path = f"file:bakery_test_{worker_id}_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+    # The database lives as long as at least one connection is open,
+    # so this one is held until the module's tests are done
+    conn = sqlite3.connect(db_path, uri=True)
     cursor = conn.cursor()
 
     # Create schema
@@ -33,51 +35,80 @@ def temp_database():
         )
     """)
 
-    # Insert test data
-    materials = TestDataFactory.create_material_costs()
-    for mat in materials:
-        cursor.execute(
-            "INSERT INTO materials (name, unit, unit_cost, currency, last_updated) VALUES (?, ?, ?, ?, ?)",
-            (mat['name'], mat['unit'], mat['unit_cost'], mat['currency'], '2025-12-18')
-        )
+    # Insert test data with one multi-row statement, row values zipped from the columns
+    columns = TestDataFactory.create_material_costs_soa()
+    rows = ", ".join(["(?, ?, ?, ?, ?)"] * len(columns[0]))
+    cursor.execute(
+        f"INSERT INTO materials (name, unit, unit_cost, currency, last_updated) VALUES {rows}",
+        [value for row in zip(*columns, strict=True) for value in row]
+    )
 
     conn.commit()
-    conn.close()
 
     yield db_path
 
-    # Cleanup
-    Path(db_path).unlink(missing_ok=True)
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def db_tool(temp_database):
+    """DatabaseTool on the shared test database, one connection for the module"""
+    with DatabaseTool(temp_database) as db:
+        yield db
+
+
+def _process_materials(bom, db, converter, calculator):
+    """Price every BOM material with one bulk cost lookup and a single pass"""
+    materials = bom['materials']
+    costs = db.get_materials_bulk([m['name'] for m in materials])
+
+    lines = [None] * len(materials)
+    for i, mat in enumerate(materials):
+        # Read each field once into locals
+        name = mat['name']
+        bom_unit = mat['unit']
+        bom_qty = mat['qty']
+        cost = costs[name]
+        db_unit = cost['unit']
+        unit_cost = cost['unit_cost']
+
+        qty = bom_qty
+        if bom_unit != db_unit and converter.can_convert(bom_unit, db_unit):
+            qty = converter.convert(bom_qty, bom_unit, db_unit)
+
+        lines[i] = LineInput(
+            name, bom_qty, bom_unit, unit_cost, calculator.calculate_line_cost(qty, unit_cost)
+        )
+
+    return lines
 
 
 class TestToolIntegration:
     """Test tools working together"""
 
-    def test_bom_to_database_lookup(self, temp_database):
+    def test_bom_to_database_lookup(self, db_tool):
         """Test getting BOM materials from database"""
-        db = DatabaseTool(temp_database)
         bom_estimate = TestDataFactory.create_bom_estimate('cupcakes', 24)
 
         # Get material names from BOM
         material_names = [m['name'] for m in bom_estimate['materials']]
 
         # Look up costs
-        costs = db.get_materials_bulk(material_names)
+        costs = db_tool.get_materials_bulk(material_names)
 
         # Verify all materials found
         assert len(costs) == len(material_names)
         assert 'flour' in costs
         assert costs['flour']['unit_cost'] == 0.90
 
-    def test_converter_with_bom_and_database(self, temp_database):
+    def test_converter_with_bom_and_database(self, db_tool):
         """Test unit conversion between BOM and database"""
-        db = DatabaseTool(temp_database)
         converter = UnitConverter()
         bom_estimate = TestDataFactory.create_bom_estimate('cupcakes', 24)
 
         # Get a material - get_material_cost returns MaterialCost object
         bom_material = bom_estimate['materials'][0]  # flour
-        db_material = db.get_material_cost('flour')
+        db_material = db_tool.get_material_cost('flour')
 
         # MaterialCost has attributes
         bom_qty = bom_material['qty']
@@ -93,49 +124,12 @@ class TestToolIntegration:
         cost = converted_qty * db_material.unit_cost
         assert cost > 0
 
-    def test_full_calculation_pipeline(self, temp_database):
+    def test_full_calculation_pipeline(self, db_tool, calculator, converter):
         """Test complete calculation from BOM to totals"""
-        db = DatabaseTool(temp_database)
-        converter = UnitConverter()
-        calculator = PricingCalculator(
-            labor_rate=15.0,
-            markup_pct=0.30,
-            vat_pct=0.20
-        )
-
         bom_estimate = TestDataFactory.create_bom_estimate('cupcakes', 24)
 
-        # Get material costs
-        material_names = [m['name'] for m in bom_estimate['materials']]
-        costs = db.get_materials_bulk(material_names)
-
-        # Build material lines
-        lines = []
-        for material in bom_estimate['materials']:
-            name = material['name']
-            qty = material['qty']
-            bom_unit = material['unit']
-
-            # get_materials_bulk returns dicts
-            cost_data = costs[name]
-            db_unit = cost_data['unit']
-            unit_cost = cost_data['unit_cost']
-
-            # Convert units
-            if bom_unit != db_unit and converter.can_convert(bom_unit, db_unit):
-                qty_converted = converter.convert(qty, bom_unit, db_unit)
-            else:
-                qty_converted = qty
-
-            line_cost = calculator.calculate_line_cost(qty_converted, unit_cost)
-
-            lines.append({
-                'name': name,
-                'qty': qty,
-                'unit': bom_unit,
-                'unit_cost': unit_cost,
-                'line_cost': line_cost
-            })
+        # Get material costs and build material lines
+        lines = _process_materials(bom_estimate, db_tool, converter, calculator)
 
         # Calculate totals
         calc = calculator.calculate_quote(
@@ -149,97 +143,41 @@ class TestToolIntegration:
         assert calc.total > calc.subtotal
         assert len(calc.lines) == len(bom_estimate['materials'])
 
-    def test_complete_workflow_cupcakes(self, temp_database):
-        """Test complete workflow for cupcakes"""
-        # Initialize tools
-        db = DatabaseTool(temp_database)
-        converter = UnitConverter()
-        calculator = PricingCalculator(labor_rate=15.0, markup_pct=0.30, vat_pct=0.20)
-
+    @pytest.mark.parametrize(
+        "job_type,quantity,expected_lines,min_total",
+        [
+            ('cupcakes', 24, 7, 0),
+            ('cake', 1, 5, 10),  # Reasonable minimum for a cake
+        ],
+    )
+    def test_complete_workflow(
+        self, db_tool, calculator, converter, job_type, quantity, expected_lines, min_total
+    ):
+        """Test complete workflow for each job type"""
         # Get BOM estimate
-        bom = TestDataFactory.create_bom_estimate('cupcakes', 24)
-        assert bom['job_type'] == 'cupcakes'
-        assert bom['quantity'] == 24
-
-        # Fetch material costs
-        material_names = [m['name'] for m in bom['materials']]
-        costs = db.get_materials_bulk(material_names)
-        assert len(costs) == len(material_names)
-
-        # Process materials with unit conversion
-        processed_materials = []
-        for mat in bom['materials']:
-            # get_materials_bulk returns dicts
-            db_mat = costs[mat['name']]
+        bom = TestDataFactory.create_bom_estimate(job_type, quantity)
+        assert bom['job_type'] == job_type
+        assert bom['quantity'] == quantity
 
-            # Convert units if needed
-            if mat['unit'] != db_mat['unit']:
-                qty = converter.convert(mat['qty'], mat['unit'], db_mat['unit'])
-            else:
-                qty = mat['qty']
-
-            line_cost = calculator.calculate_line_cost(qty, db_mat['unit_cost'])
-
-            processed_materials.append({
-                'name': mat['name'],
-                'qty': mat['qty'],
-                'unit': mat['unit'],
-                'unit_cost': db_mat['unit_cost'],
-                'line_cost': line_cost
-            })
+        # Fetch material costs and process materials with unit conversion
+        processed_materials = _process_materials(bom, db_tool, converter, calculator)
+        assert len(processed_materials) == len(bom['materials'])
 
         # Calculate quote
         quote = calculator.calculate_quote(processed_materials, bom['labor_hours'])
 
         # Verify structure
-        assert quote.total > 0
+        assert quote.total > min_total
         assert quote.vat_value > 0
         assert quote.markup_value > 0
-        assert len(quote.lines) == 7  # cupcakes has 7 materials
+        assert len(quote.lines) == expected_lines
 
-    def test_complete_workflow_cake(self, temp_database):
-        """Test complete workflow for cake"""
-        db = DatabaseTool(temp_database)
-        converter = UnitConverter()
-        calculator = PricingCalculator(labor_rate=15.0, markup_pct=0.30, vat_pct=0.20)
-
-        # Get BOM estimate for cake (1 unit)
-        bom = TestDataFactory.create_bom_estimate('cake', 1)
-
-        # Process workflow
-        material_names = [m['name'] for m in bom['materials']]
-        costs = db.get_materials_bulk(material_names)
-
-        lines = []
-        for mat in bom['materials']:
-            # get_materials_bulk returns dicts
-            db_mat = costs[mat['name']]
-            qty = mat['qty']
-            if mat['unit'] != db_mat['unit'] and converter.can_convert(mat['unit'], db_mat['unit']):
-                qty = converter.convert(qty, mat['unit'], db_mat['unit'])
-
-            line_cost = calculator.calculate_line_cost(qty, db_mat['unit_cost'])
-            lines.append({
-                'name': mat['name'],
-                'qty': mat['qty'],
-                'unit': mat['unit'],
-                'unit_cost': db_mat['unit_cost'],
-                'line_cost': line_cost
-            })
-
-        quote = calculator.calculate_quote(lines, bom['labor_hours'])
-
-        # Cake should be more expensive than cupcakes (higher labor)
-        assert quote.total > 10  # Reasonable minimum for a cake
-        assert len(quote.lines) == 5  # cake has 5 materials
-
-    def test_unit_conversion_integration(self, temp_database):
+    def test_unit_conversion_integration(self, db_tool):
         """Test unit conversion across components"""
-        db = DatabaseTool(temp_database)
         converter = UnitConverter()
 
         # Test conversion scenario: BOM in grams, DB in kg
-        flour_db = db.get_material_cost('flour')
+        flour_db = db_tool.get_material_cost('flour')
         assert flour_db.unit == 'kg'
 
         # BOM says 500g
@@ -254,13 +192,11 @@ class TestToolIntegration:
         cost = converted_qty * flour_db.unit_cost
         assert cost == pytest.approx(0.45, 0.01)  # 0.5 kg * 0.90
 
-    def test_database_bulk_operations(self, temp_database):
+    def test_database_bulk_operations(self, db_tool):
         """Test bulk database operations in workflow"""
-        db = DatabaseTool(temp_database)
-
         # Get multiple materials at once
         materials = ['flour', 'sugar', 'butter', 'eggs']
-        costs = db.get_materials_bulk(materials)
+        costs = db_tool.get_materials_bulk(materials)
 
         assert len(costs) == 4
         assert all(name in costs for name in materials)
@@ -300,20 +236,16 @@ class TestToolIntegration:
 class TestErrorHandling:
     """Test error handling in integrated workflows"""
 
-    def test_missing_material_in_database(self, temp_database):
+    def test_missing_material_in_database(self, db_tool):
         """Test handling of missing materials"""
-        db = DatabaseTool(temp_database)
-
         # get_material_cost returns None, use get_material_cost_strict for exception
-        from src.tools.database_tool import MaterialNotFoundError
         with pytest.raises(MaterialNotFoundError):
-            db.get_material_cost_strict('nonexistent_material')
+            db_tool.get_material_cost_strict('nonexistent_material')
 
     def test_incompatible_unit_conversion(self):
         """Test handling of incompatible unit conversions"""
         converter = UnitConverter()
 
-        from src.converter import UnitConversionError
         with pytest.raises(UnitConversionError):
             converter.convert(1.0, 'kg', 'L')  # Can't convert mass to volume
 
@@ -0,0 +1,53 @@
+"""Shared fixtures for unit tests"""
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+from src.tools.bom_tool import BOMAPITool
+from tests.fixtures.http_stub import BOMAPIStub
+
+
+@pytest.fixture(scope="module")
+def bom_api():
+    """Stub BOM API behind a real httpx.Client, patched in once per module
+
+    Tests sharing it must reset its routes between runs (see
+    test_bom_tool's autouse _reset_routes fixture).
+    """
+    stub = BOMAPIStub()
+    with patch('httpx.Client', stub.client):
+        yield stub
+
+
+@pytest.fixture(scope="module")
+def bom_tool(bom_api):
+    """Create BOM API tool against the stub API, shared per module"""
+    return BOMAPITool(base_url="http://localhost:8000")
+
+
+def _lines(*rows):
+    """Read-only material lines from (name, qty, unit, unit_cost, line_cost) rows"""
+    keys = ('name', 'qty', 'unit', 'unit_cost', 'line_cost')
+    return tuple(MappingProxyType(dict(zip(keys, row, strict=True))) for row in rows)
+
+
+@pytest.fixture(scope="session")
+def sample_materials():
+    """Sample material list for testing (read-only, shared per session)"""
+    return _lines(
+        ('flour', 1.92, 'kg', 0.90, 1.73),
+        ('sugar', 1.44, 'kg', 0.70, 1.01),
+        ('butter', 0.96, 'kg', 4.50, 4.32),
+        ('eggs', 12.0, 'each', 0.18, 2.16),
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_materials_full(sample_materials):
+    """Full 24-cupcake material list from the specification example"""
+    return sample_materials + _lines(
+        ('milk', 1.2, 'L', 0.60, 0.72),
+        ('vanilla', 24.0, 'ml', 0.05, 1.20),
+        ('baking_powder', 0.024, 'kg', 3.00, 0.07),
+    )
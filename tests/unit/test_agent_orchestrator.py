@@ -3,47 +3,115 @@
 Tests the core orchestrator logic without full LangChain dependencies.
 Focuses on tool functions, state management, and calculation logic.
 """
-# Mock LangChain before imports
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+# LangChain is stubbed in tests/conftest.py before this module is imported
+import os
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-sys.modules['langchain.agents'] = MagicMock()
-sys.modules['langchain.prompts'] = MagicMock()
-sys.modules['langchain.memory'] = MagicMock()
-sys.modules['langchain.tools'] = MagicMock()
-sys.modules['langchain_openai'] = MagicMock()
-
 from src.agent.orchestrator import BakeryQuotationAgent
 from src.config import Config
 from src.models import QuoteState
+from src.tools.bom_tool import APIConnectionError, BOMAPITool, JobType
+from tests.fixtures.http_stub import make_response
+
+_TEMPLATE_BYTES = b"# Quote {{quote_id}}\nCustomer: {{customer_name}}\nTotal: {{currency}}{{total}}"
+
+# Read-only calc dicts shaped like _calculate_quote_totals() output; the
+# proxies make any mutation by _prepare_template_data fail the tests
+_CALC_TEMPLATE = MappingProxyType({
+    'lines': (
+        MappingProxyType({'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73}),
+    ),
+    'materials_subtotal': 1.73,
+    'labor_hours': 1.2,
+    'labor_rate': 15.0,
+    'labor_cost': 18.0,
+    'subtotal': 19.73,
+    'markup_pct': 30.0,
+    'markup_value': 5.92,
+    'price_before_vat': 25.65,
+    'vat_pct': 20.0,
+    'vat_value': 5.13,
+    'total': 30.78
+})
+
+_CALC_FORMATTING = MappingProxyType({
+    'lines': (
+        MappingProxyType({'name': 'item', 'qty': 1.234, 'unit': 'kg', 'unit_cost': 5.678, 'line_cost': 7.012}),
+    ),
+    'materials_subtotal': 7.01,
+    'labor_hours': 1.5,
+    'labor_rate': 15.0,
+    'labor_cost': 22.50,
+    'subtotal': 29.51,
+    'markup_pct': 30.0,
+    'markup_value': 8.85,
+    'price_before_vat': 38.36,
+    'vat_pct': 20.0,
+    'vat_value': 7.67,
+    'total': 46.03
+})
+
+
+@pytest.fixture(scope="session")
+def shared_template_dir(tmp_path_factory):
+    """Directory holding the agent test template, written once per session"""
+    template_dir = tmp_path_factory.mktemp("bakery")
+    (template_dir / "template.md").write_bytes(_TEMPLATE_BYTES)
+    return template_dir
+
+
+def _agent_config(materials_database, template_dir):
+    """Config pointing at the shared materials DB and shared template"""
+    return Config(
+        openai_api_key="test-key",
+        database_path=materials_database,
+        template_path=str(template_dir / "template.md"),
+        output_dir=str(template_dir / "output"),
+        skip_startup_checks=True
+    )
 
 
-@pytest.fixture
-def mock_agent(temp_database, temp_dir):
-    """Create agent with mocked LangChain components"""
-    template_path = temp_dir / "template.md"
-    template_path.write_text("# Quote {{quote_id}}\nCustomer: {{customer_name}}\nTotal: {{currency}}{{total}}")
+def _reset_after_test(agent):
+    """Hand out a shared agent and return it to its initial state afterwards"""
+    bom_tool = agent.bom_tool
+    company_name = agent.quote_state.company_name  # survives reset()
+    yield agent
+    agent.bom_tool = bom_tool
+    agent.reset()
+    agent.quote_state.company_name = company_name
+
+
+@pytest.fixture(scope="module")
+def _shared_agent(materials_database, shared_template_dir):
+    """Create agent with mocked LangChain components once per module"""
+    return BakeryQuotationAgent(_agent_config(materials_database, shared_template_dir))
 
-    config = Config(
-        openai_api_key="test-key",
-        database_path=temp_database,
-        template_path=str(template_path),
-        output_dir=str(temp_dir / "output")
-    )
 
-    with patch('httpx.Client') as mock_httpx:
-        mock_instance = MagicMock()
-        mock_health = Mock()
-        mock_health.status_code = 200
-        mock_health.json.return_value = {"status": "ok"}
-        mock_instance.get.return_value = mock_health
-        mock_httpx.return_value = mock_instance
+@pytest.fixture(scope="module")
+def _light_agent(materials_database, shared_template_dir):
+    """Create agent with an empty BOM tool stand-in, skipping httpx and the health check
 
-        agent = BakeryQuotationAgent(config)
-        yield agent
+    Tests using it must not reach the BOM API; any attempt fails with
+    AttributeError instead of returning a MagicMock.
+    """
+    config = _agent_config(materials_database, shared_template_dir)
+    return BakeryQuotationAgent(config, bom_tool=SimpleNamespace())
+
+
+@pytest.fixture
+def mock_agent(_shared_agent):
+    """Shared agent with a real BOM API client (tests patch httpx to use it)"""
+    yield from _reset_after_test(_shared_agent)
+
+
+@pytest.fixture
+def mock_agent_light(_light_agent):
+    """Shared agent for tests that never call the BOM API"""
+    yield from _reset_after_test(_light_agent)
 
 
 class TestQuoteStateManagement:
@@ -90,24 +158,24 @@ class TestQuoteStateManagement:
 class TestCalculationLogic:
     """Test quote calculation logic"""
 
-    def test_calculate_quote_totals(self, mock_agent):
+    def test_calculate_quote_totals(self, mock_agent_light):
         """Test quote totals calculation"""
         # Set up state
-        mock_agent.quote_state.bom_data = {
+        mock_agent_light.quote_state.bom_data = {
             'materials': [
                 {'name': 'flour', 'unit': 'kg', 'qty': 1.0},
                 {'name': 'sugar', 'unit': 'kg', 'qty': 0.5},
             ],
             'labor_hours': 1.0
         }
-        mock_agent.quote_state.material_costs = {
+        mock_agent_light.quote_state.material_costs = {
             'flour': {'unit': 'kg', 'unit_cost': 0.90, 'currency': 'GBP'},
             'sugar': {'unit': 'kg', 'unit_cost': 0.70, 'currency': 'GBP'}
         }
-        mock_agent.quote_state.quantity = 10
+        mock_agent_light.quote_state.quantity = 10
 
         # Calculate
-        calc = mock_agent._calculate_quote_totals()
+        calc = mock_agent_light._calculate_quote_totals()
 
         # Verify - calc is now a dict
         assert calc['materials_subtotal'] == pytest.approx(1.25)  # 0.90 + 0.35
@@ -118,21 +186,21 @@ class TestCalculationLogic:
         assert calc['total'] > calc['subtotal']
         assert calc['unit_price'] == pytest.approx(calc['total'] / 10)
 
-    def test_calculate_with_unit_conversion(self, mock_agent):
+    def test_calculate_with_unit_conversion(self, mock_agent_light):
         """Test calculation handles unit conversions"""
         # BOM in ml, DB in L (would need conversion if we had L unit)
-        mock_agent.quote_state.bom_data = {
+        mock_agent_light.quote_state.bom_data = {
             'materials': [
                 {'name': 'vanilla', 'unit': 'ml', 'qty': 50.0},
             ],
             'labor_hours': 0.5
         }
-        mock_agent.quote_state.material_costs = {
+        mock_agent_light.quote_state.material_costs = {
             'vanilla': {'unit': 'ml', 'unit_cost': 0.05, 'currency': 'GBP'}
         }
-        mock_agent.quote_state.quantity = 1
+        mock_agent_light.quote_state.quantity = 1
 
-        calc = mock_agent._calculate_quote_totals()
+        calc = mock_agent_light._calculate_quote_totals()
 
         assert calc['materials_subtotal'] == pytest.approx(2.50)  # 50 * 0.05
 
@@ -140,35 +208,17 @@ class TestCalculationLogic:
 class TestTemplateDataPreparation:
     """Test template data preparation"""
 
-    def test_prepare_template_data(self, mock_agent):
+    def test_prepare_template_data(self, mock_agent_light):
         """Test template data formatting"""
         # Set up state
-        mock_agent.quote_state.job_type = 'cupcakes'
-        mock_agent.quote_state.quantity = 24
-        mock_agent.quote_state.customer_name = 'Test Customer'
-        mock_agent.quote_state.company_name = 'Test Bakery'
-        mock_agent.quote_state.due_date = '2025-12-25'
-
-        # Create calc dict like _calculate_quote_totals() returns
-        calculations = {
-            'lines': [
-                {'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73}
-            ],
-            'materials_subtotal': 1.73,
-            'labor_hours': 1.2,
-            'labor_rate': 15.0,
-            'labor_cost': 18.0,
-            'subtotal': 19.73,
-            'markup_pct': 30.0,
-            'markup_value': 5.92,
-            'price_before_vat': 25.65,
-            'vat_pct': 20.0,
-            'vat_value': 5.13,
-            'total': 30.78
-        }
+        mock_agent_light.quote_state.job_type = 'cupcakes'
+        mock_agent_light.quote_state.quantity = 24
+        mock_agent_light.quote_state.customer_name = 'Test Customer'
+        mock_agent_light.quote_state.company_name = 'Test Bakery'
+        mock_agent_light.quote_state.due_date = '2025-12-25'
 
         # Prepare
-        template_data = mock_agent._prepare_template_data(calculations)
+        template_data = mock_agent_light._prepare_template_data(_CALC_TEMPLATE)
 
         # Verify
         assert 'quote_id' in template_data
@@ -179,32 +229,15 @@ class TestTemplateDataPreparation:
         assert 'total' in template_data
         assert template_data['currency'] == 'GBP'
 
-    def test_template_data_formatting(self, mock_agent):
+    def test_template_data_formatting(self, mock_agent_light):
         """Test that numbers are properly formatted"""
-        mock_agent.quote_state.job_type = 'test'
-        mock_agent.quote_state.quantity = 1
-        mock_agent.quote_state.customer_name = 'Customer'
-        mock_agent.quote_state.company_name = 'Company'
-        mock_agent.quote_state.due_date = '2025-12-20'
-
-        calculations = {
-            'lines': [
-                {'name': 'item', 'qty': 1.234, 'unit': 'kg', 'unit_cost': 5.678, 'line_cost': 7.012}
-            ],
-            'materials_subtotal': 7.01,
-            'labor_hours': 1.5,
-            'labor_rate': 15.0,
-            'labor_cost': 22.50,
-            'subtotal': 29.51,
-            'markup_pct': 30.0,
-            'markup_value': 8.85,
-            'price_before_vat': 38.36,
-            'vat_pct': 20.0,
-            'vat_value': 7.67,
-            'total': 46.03
-        }
+        mock_agent_light.quote_state.job_type = 'test'
+        mock_agent_light.quote_state.quantity = 1
+        mock_agent_light.quote_state.customer_name = 'Customer'
+        mock_agent_light.quote_state.company_name = 'Company'
+        mock_agent_light.quote_state.due_date = '2025-12-20'
 
-        data = mock_agent._prepare_template_data(calculations)
+        data = mock_agent_light._prepare_template_data(_CALC_FORMATTING)
 
         # Check formatting (should be strings with 2 decimals)
         assert data['labor_hours'] == '1.5'
@@ -220,22 +253,14 @@ class TestBOMToolIntegration:
         with patch('httpx.Client') as mock_httpx:
             mock_instance = MagicMock()
 
-            # Health check
-            mock_health = Mock()
-            mock_health.status_code = 200
-            mock_health.json.return_value = {"status": "ok"}
-
-            # Job types response
-            mock_types = Mock()
-            mock_types.status_code = 200
-            mock_types.raise_for_status = Mock()
-            mock_types.json.return_value = ["cupcakes", "cake", "pastry_box"]
-
-            mock_instance.get.side_effect = [mock_health, mock_types]
+            # Health check, then job types response
+            mock_instance.get.side_effect = [
+                make_response(200, {"status": "ok"}),
+                make_response(200, ["cupcakes", "cake", "pastry_box"]),
+            ]
             mock_httpx.return_value = mock_instance
 
             # Reinitialize BOM tool
-            from src.tools.bom_tool import BOMAPITool
             mock_agent.bom_tool = BOMAPITool(base_url="http://localhost:8000")
 
             result = mock_agent.bom_tool.get_job_types()
@@ -247,29 +272,18 @@ class TestBOMToolIntegration:
         """Test that BOM estimate updates agent state"""
         with patch('httpx.Client') as mock_httpx:
             mock_instance = MagicMock()
-
-            mock_health = Mock()
-            mock_health.status_code = 200
-            mock_health.json.return_value = {"status": "ok"}
-
-            mock_estimate = Mock()
-            mock_estimate.status_code = 200
-            mock_estimate.raise_for_status = Mock()
-            mock_estimate.json.return_value = {
+            mock_instance.get.return_value = make_response(200, {"status": "ok"})
+            mock_instance.post.return_value = make_response(200, {
                 'job_type': 'cupcakes',
                 'quantity': 24,
                 'materials': [
                     {'name': 'flour', 'unit': 'kg', 'qty': 1.92},
                 ],
                 'labor_hours': 1.2
-            }
-
-            mock_instance.get.return_value = mock_health
-            mock_instance.post.return_value = mock_estimate
+            }, method="POST")
             mock_httpx.return_value = mock_instance
 
             # Reinitialize BOM tool
-            from src.tools.bom_tool import BOMAPITool, JobType
             mock_agent.bom_tool = BOMAPITool(base_url="http://localhost:8000")
 
             # Call BOM estimate - returns EstimateResponse object
@@ -295,17 +309,17 @@ class TestBOMToolIntegration:
 class TestDatabaseToolIntegration:
     """Test database tool integration with agent"""
 
-    def test_query_material_costs(self, mock_agent):
+    def test_query_material_costs(self, mock_agent_light):
         """Test query_material_costs via database tool"""
-        costs = mock_agent.db_tool.get_materials_bulk(['flour', 'sugar'])
+        costs = mock_agent_light.db_tool.get_materials_bulk(['flour', 'sugar'])
 
         assert 'flour' in costs
         assert 'sugar' in costs
         assert costs['flour']['unit_cost'] > 0
 
-    def test_query_material_costs_with_missing(self, mock_agent):
+    def test_query_material_costs_with_missing(self, mock_agent_light):
         """Test query_material_costs handles missing materials"""
-        costs = mock_agent.db_tool.get_materials_bulk(['flour', 'unicorn_dust'])
+        costs = mock_agent_light.db_tool.get_materials_bulk(['flour', 'unicorn_dust'])
 
         # Should have flour but not unicorn_dust
         assert 'flour' in costs
@@ -343,26 +357,26 @@ class TestCompleteWorkflow:
 
         # Render quote
         output_path = mock_agent.template_tool.render_and_save(template_data)
-        assert Path(output_path).exists()
+        assert os.path.exists(output_path)
 
 
 class TestAgentReset:
     """Test agent reset functionality"""
 
-    def test_agent_reset_clears_state(self, mock_agent):
+    def test_agent_reset_clears_state(self, mock_agent_light):
         """Test reset clears agent state"""
         # Set state
-        mock_agent.quote_state.job_type = 'cupcakes'
-        mock_agent.quote_state.quantity = 24
-        mock_agent.quote_state.customer_name = 'Test'
+        mock_agent_light.quote_state.job_type = 'cupcakes'
+        mock_agent_light.quote_state.quantity = 24
+        mock_agent_light.quote_state.customer_name = 'Test'
 
         # Reset
-        mock_agent.reset()
+        mock_agent_light.reset()
 
         # Verify cleared
-        assert mock_agent.quote_state.job_type is None
-        assert mock_agent.quote_state.quantity is None
-        assert mock_agent.quote_state.customer_name is None
+        assert mock_agent_light.quote_state.job_type is None
+        assert mock_agent_light.quote_state.quantity is None
+        assert mock_agent_light.quote_state.customer_name is None
 
 
 class TestErrorHandling:
@@ -381,11 +395,9 @@ class TestErrorHandling:
         )
 
         with patch('httpx.Client') as mock_httpx:
-            import httpx
             mock_instance = MagicMock()
             mock_instance.get.side_effect = httpx.ConnectError("Connection refused")
             mock_httpx.return_value = mock_instance
 
-            from src.tools.bom_tool import APIConnectionError
             with pytest.raises(APIConnectionError):
                 BakeryQuotationAgent(config)
@@ -1,5 +1,8 @@
 """Tests for BOM API tool"""
-from unittest.mock import MagicMock, Mock, patch
+import json
+import threading
+import time
+from unittest.mock import patch
 
 import httpx
 import pytest
@@ -13,47 +16,55 @@ from src.tools.bom_tool import (
     JobType,
     Material,
 )
+from tests.fixtures.http_stub import JOB_TYPES
 
+# Tests share one stub API and tool; keep them on a single xdist worker
+pytestmark = pytest.mark.xdist_group("bom_mock")
 
-@pytest.fixture
-def mock_health_response():
-    """Mock successful health check response"""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"status": "ok"}
-    return mock_response
+# Cupcakes estimate body returned by the stub API; use {**_ESTIMATE_JSON, ...} for variants
+_ESTIMATE_JSON = {
+    'job_type': 'cupcakes',
+    'quantity': 24,
+    'materials': [
+        {'name': 'flour', 'unit': 'kg', 'qty': 1.92},
+        {'name': 'sugar', 'unit': 'kg', 'qty': 1.44},
+    ],
+    'labor_hours': 1.2
+}
 
 
-@pytest.fixture
-def mock_httpx_client(mock_health_response):
-    """Mock httpx client with health check"""
-    with patch('httpx.Client') as mock_client:
-        mock_instance = MagicMock()
-        # Mock the health check that happens in __init__
-        mock_instance.get.return_value = mock_health_response
-        mock_client.return_value = mock_instance
-        yield mock_instance
+@pytest.fixture(autouse=True)
+def _reset_routes(bom_api, bom_tool):
+    """Clear routes, calls and cached job types left by earlier tests; serve the default job types"""
+    bom_api.reset()
+    bom_tool.clear_job_types_cache()
+    bom_api.respond("GET", "/job-types", json=JOB_TYPES)
 
 
 @pytest.fixture
-def bom_tool(mock_httpx_client):
-    """Create BOM API tool with mocked client"""
-    return BOMAPITool(base_url="http://localhost:8000")
+def mock_estimate_post(bom_api):
+    """Route POST /estimate to the cupcakes estimate"""
+    bom_api.respond("POST", "/estimate", json=_ESTIMATE_JSON)
 
 
 class TestBOMAPITool:
     """Test suite for BOM API tool"""
 
-    def test_initialization(self, mock_httpx_client):
+    def test_initialization(self, bom_api):
         """Test tool initialization"""
         tool = BOMAPITool(base_url="http://localhost:8000")
         assert tool.base_url == "http://localhost:8000"
         assert tool.timeout == 10.0
         assert tool.max_retries == 3
         # Verify health check was called during init
-        mock_httpx_client.get.assert_called_with("/healthz")
+        assert bom_api.calls[-1].url.path == "/job-types"
+
+    def test_initialization_without_verify(self, bom_api):
+        """Test the startup health check can be skipped"""
+        BOMAPITool(base_url="http://localhost:8000", verify=False)
+        assert bom_api.calls == []
 
-    def test_custom_initialization(self, mock_httpx_client):
+    def test_custom_initialization(self, bom_api):
         """Test initialization with custom parameters"""
         tool = BOMAPITool(
             base_url="http://api.example.com",
@@ -64,83 +75,96 @@ class TestBOMAPITool:
         assert tool.timeout == 30.0
         assert tool.max_retries == 5
 
-    def test_is_healthy_success(self, bom_tool, mock_httpx_client):
-        """Test successful health check"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "ok"}
-        mock_httpx_client.get.return_value = mock_response
+    def test_connection_pool_configured(self):
+        """Test the HTTP client keeps a pool of reusable connections"""
+        with patch('httpx.Client') as mock_client:
+            BOMAPITool(base_url="http://localhost:8000", verify=False)._get_client()
+
+        limits = mock_client.call_args.kwargs['limits']
+        assert limits.max_keepalive_connections >= 10
+        assert limits.max_connections >= limits.max_keepalive_connections
 
+    def test_is_healthy_success(self, bom_tool):
+        """Test successful health check"""
         result = bom_tool.is_healthy()
         assert result is True
 
-    def test_is_healthy_failure(self, bom_tool, mock_httpx_client):
+    def test_is_healthy_failure(self, bom_tool, bom_api):
         """Test failed health check"""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_httpx_client.get.return_value = mock_response
+        bom_api.respond("GET", "/job-types", status=500)
 
         result = bom_tool.is_healthy()
         assert result is False
 
-    def test_get_job_types_success(self, bom_tool, mock_httpx_client):
+    def test_get_job_types_success(self, bom_tool, bom_api):
         """Test getting job types"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = ["cupcakes", "cake", "pastry_box"]
-        mock_response.raise_for_status = Mock()
-        mock_httpx_client.get.return_value = mock_response
+        bom_api.respond("GET", "/job-types", json=JOB_TYPES)
 
         job_types = bom_tool.get_job_types()
         assert len(job_types) == 3
         assert "cupcakes" in job_types
         assert "cake" in job_types
 
-    def test_get_job_types_error(self, bom_tool, mock_httpx_client):
+    def test_get_job_types_cached(self, bom_tool, bom_api):
+        """Test job types are reused until the cache is cleared"""
+        bom_api.respond("GET", "/job-types", json=JOB_TYPES)
+
+        assert bom_tool.get_job_types() == bom_tool.get_job_types()
+        assert len(bom_api.calls) == 1
+
+        bom_tool.clear_job_types_cache()
+        bom_tool.get_job_types()
+        assert len(bom_api.calls) == 2
+
+    def test_validate_job_type_ignores_non_string_entries(self, bom_tool, bom_api):
+        """Test malformed job-type entries don't break validation"""
+        bom_api.respond("GET", "/job-types", json=["cupcakes", 3, None])
+
+        assert bom_tool.get_job_types() == ["cupcakes", 3, None]
+        assert bom_tool.validate_job_type("Cupcakes")
+        assert not bom_tool.validate_job_type("3")
+
+    def test_get_job_types_error(self, bom_tool, bom_api):
         """Test job types with API error"""
-        import httpx
-        mock_httpx_client.get.side_effect = httpx.HTTPError("Connection failed")
+        bom_api.fail("GET", "/job-types", httpx.ConnectError("Connection failed"))
 
         with pytest.raises(APIConnectionError):
             bom_tool.get_job_types()
 
-    def test_estimate_success(self, bom_tool, mock_httpx_client):
-        """Test successful estimate request"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = Mock()
-        mock_response.json.return_value = {
-            'job_type': 'cupcakes',
-            'quantity': 24,
-            'materials': [
-                {'name': 'flour', 'unit': 'kg', 'qty': 1.92},
-                {'name': 'sugar', 'unit': 'kg', 'qty': 1.44},
-            ],
-            'labor_hours': 1.2
-        }
-        mock_httpx_client.post.return_value = mock_response
-
+    @pytest.mark.parametrize("check", [
+        pytest.param(
+            lambda r, t: (
+                isinstance(r, EstimateResponse)
+                and (r.job_type, r.quantity, len(r.materials), r.labor_hours) == ('cupcakes', 24, 2, 1.2)
+            ),
+            id="estimate",
+        ),
+        pytest.param(
+            lambda r, t: all(s in t.format_estimate(r) for s in ('cupcakes', '24', 'flour', '1.2')),
+            id="format_estimate",
+        ),
+        pytest.param(
+            lambda r, t: t.estimate_summary(r).items() >= {
+                'job_type': 'cupcakes', 'quantity': 24, 'material_count': 2, 'labor_hours': 1.2
+            }.items(),
+            id="estimate_summary",
+        ),
+    ])
+    def test_estimate_success(self, bom_tool, mock_estimate_post, check):
+        """Test successful estimate request, formatting and summary"""
         result = bom_tool.estimate('cupcakes', 24)
+        assert check(result, bom_tool)
 
-        assert isinstance(result, EstimateResponse)
-        assert result.job_type == 'cupcakes'
-        assert result.quantity == 24
-        assert len(result.materials) == 2
-        assert result.labor_hours == 1.2
-
-    def test_estimate_invalid_job_type(self, bom_tool, mock_httpx_client):
-        """Test estimate with invalid job type"""
-        import httpx
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {'detail': 'Invalid job type'}
-        mock_response.raise_for_status = Mock(side_effect=httpx.HTTPStatusError(
-            "Bad Request", request=Mock(), response=mock_response
-        ))
-        mock_httpx_client.post.return_value = mock_response
-
-        with pytest.raises(InvalidJobTypeError):
-            bom_tool.estimate('invalid_job', 24)
+    @pytest.mark.parametrize("status,job_type,expected_exc", [
+        (400, 'invalid_job', InvalidJobTypeError),
+        (500, 'cupcakes', APIConnectionError),
+    ])
+    def test_estimate_http_error(self, bom_tool, bom_api, status, job_type, expected_exc):
+        """Test estimate maps API error statuses to tool exceptions"""
+        bom_api.respond("POST", "/estimate", status=status, json={'detail': 'Invalid job type'})
+
+        with pytest.raises(expected_exc):
+            bom_tool.estimate(job_type, 24)
 
     def test_estimate_invalid_quantity(self, bom_tool):
         """Test estimate with invalid quantity"""
@@ -150,79 +174,8 @@ class TestBOMAPITool:
         with pytest.raises(ValueError):
             bom_tool.estimate('cupcakes', -5)
 
-    def test_estimate_api_error(self, bom_tool, mock_httpx_client):
-        """Test estimate with API error"""
-        import httpx
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.raise_for_status = Mock(side_effect=httpx.HTTPStatusError(
-            "Server Error", request=Mock(), response=mock_response
-        ))
-        mock_httpx_client.post.return_value = mock_response
-
-        with pytest.raises(APIConnectionError):
-            bom_tool.estimate('cupcakes', 24)
-
-    def test_format_estimate(self, bom_tool, mock_httpx_client):
-        """Test estimate formatting"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = Mock()
-        mock_response.json.return_value = {
-            'job_type': 'cupcakes',
-            'quantity': 24,
-            'materials': [
-                {'name': 'flour', 'unit': 'kg', 'qty': 1.92},
-            ],
-            'labor_hours': 1.2
-        }
-        mock_httpx_client.post.return_value = mock_response
-
-        result = bom_tool.estimate('cupcakes', 24)
-        formatted = bom_tool.format_estimate(result)
-
-        assert 'cupcakes' in formatted
-        assert '24' in formatted
-        assert 'flour' in formatted
-        assert '1.2' in formatted
-
-    def test_estimate_summary(self, bom_tool, mock_httpx_client):
-        """Test estimate summary"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = Mock()
-        mock_response.json.return_value = {
-            'job_type': 'cupcakes',
-            'quantity': 24,
-            'materials': [
-                {'name': 'flour', 'unit': 'kg', 'qty': 1.92},
-                {'name': 'sugar', 'unit': 'kg', 'qty': 1.44},
-            ],
-            'labor_hours': 1.2
-        }
-        mock_httpx_client.post.return_value = mock_response
-
-        result = bom_tool.estimate('cupcakes', 24)
-        summary = bom_tool.estimate_summary(result)
-
-        assert summary['job_type'] == 'cupcakes'
-        assert summary['quantity'] == 24
-        assert summary['material_count'] == 2
-        assert summary['labor_hours'] == 1.2
-
-    def test_estimate_multiple_success(self, bom_tool, mock_httpx_client):
+    def test_estimate_multiple_success(self, bom_tool, mock_estimate_post):
         """Test batch estimation"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = Mock()
-        mock_response.json.return_value = {
-            'job_type': 'cupcakes',
-            'quantity': 24,
-            'materials': [{'name': 'flour', 'unit': 'kg', 'qty': 1.92}],
-            'labor_hours': 1.2
-        }
-        mock_httpx_client.post.return_value = mock_response
-
         requests = [
             ('cupcakes', 24),
             ('cake', 1),
@@ -232,19 +185,54 @@ class TestBOMAPITool:
         assert len(results) == 2
         assert all(isinstance(r, EstimateResponse) for r in results)
 
-    def test_validate_job_type(self, bom_tool, mock_httpx_client):
+    def test_estimate_multiple_is_concurrent(self, bom_tool, bom_api):
+        """Test batch estimates are requested concurrently"""
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def slow_estimate(request):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return httpx.Response(200, json=_ESTIMATE_JSON)
+
+        bom_api.handle("POST", "/estimate", slow_estimate)
+
+        results = bom_tool.estimate_multiple([('cupcakes', 24)] * 5)
+
+        assert len(results) == 5
+        assert peak > 1
+
+    def test_estimate_batch_single_request(self, bom_tool, bom_api):
+        """Test batch endpoint returns every estimate from one POST"""
+        cake = {**_ESTIMATE_JSON, 'job_type': 'cake', 'quantity': 1}
+        bom_api.respond("POST", "/estimate/batch", json=[_ESTIMATE_JSON, cake])
+
+        results = bom_tool.estimate_batch([('cupcakes', 24), ('Cake', 1)])
+
+        assert [(r.job_type, r.quantity) for r in results] == [('cupcakes', 24), ('cake', 1)]
+        assert len(bom_api.calls) == 1
+        assert json.loads(bom_api.calls[0].content) == [
+            {'job_type': 'cupcakes', 'quantity': 24},
+            {'job_type': 'cake', 'quantity': 1},
+        ]
+
+    def test_validate_job_type(self, bom_tool, bom_api):
         """Test job type validation"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = Mock()
-        mock_response.json.return_value = ["cupcakes", "cake", "pastry_box"]
-        mock_httpx_client.get.return_value = mock_response
+        bom_api.respond("GET", "/job-types", json=JOB_TYPES)
 
         assert bom_tool.validate_job_type('cupcakes') is True
         assert bom_tool.validate_job_type('cake') is True
         assert bom_tool.validate_job_type('pastry_box') is True
         assert bom_tool.validate_job_type('invalid') is False
 
+        # Job types are fetched once and reused for every validation
+        assert [c.url.path for c in bom_api.calls] == ["/job-types"]
+
     def test_pydantic_models(self):
         """Test Pydantic model validation"""
         # Test Material
@@ -267,24 +255,23 @@ class TestBOMAPITool:
         )
         assert response.job_type == JobType.CUPCAKES
         assert len(response.materials) == 1
+        assert response.names == ('flour',)
+        assert response.units == ('kg',)
+        assert response.qtys == (1.92,)
+        assert 'names' not in response.model_dump()
 
-    def test_job_type_enum(self):
-        """Test JobType enum"""
-        assert JobType.CUPCAKES.value == "cupcakes"
-        assert JobType.CAKE.value == "cake"
-        assert JobType.PASTRY_BOX.value == "pastry_box"
-
-        # Test enum creation from string
-        assert JobType("cupcakes") == JobType.CUPCAKES
+        # Columns follow the current materials
+        response.materials = []
+        assert response.names == response.units == response.qtys == ()
 
-    def test_connection_error_handling(self, bom_tool, mock_httpx_client):
+    def test_connection_error_handling(self, bom_tool, bom_api):
         """Test connection error handling"""
-        mock_httpx_client.post.side_effect = httpx.ConnectError("Connection failed")
+        bom_api.fail("POST", "/estimate", httpx.ConnectError("Connection failed"))
 
         with pytest.raises(APIConnectionError):
             bom_tool.estimate('cupcakes', 24)
 
-    def test_context_manager(self, mock_httpx_client):
+    def test_context_manager(self, bom_api):
         """Test using tool as context manager"""
         with BOMAPITool(base_url="http://localhost:8000") as tool:
             assert tool is not None
@@ -1,52 +1,16 @@
 """Tests for pricing calculator"""
 import pytest
 
-from src.calculator import MaterialLine, PricingCalculator, QuoteCalculation
-
-
-@pytest.fixture
-def calculator():
-    """Create calculator with default rates"""
-    return PricingCalculator(
-        labor_rate=15.0,
-        markup_pct=0.30,
-        vat_pct=0.20
-    )
-
-
-@pytest.fixture
-def sample_materials():
-    """Sample material list for testing"""
-    return [
-        {
-            'name': 'flour',
-            'qty': 1.92,
-            'unit': 'kg',
-            'unit_cost': 0.90,
-            'line_cost': 1.73
-        },
-        {
-            'name': 'sugar',
-            'qty': 1.44,
-            'unit': 'kg',
-            'unit_cost': 0.70,
-            'line_cost': 1.01
-        },
-        {
-            'name': 'butter',
-            'qty': 0.96,
-            'unit': 'kg',
-            'unit_cost': 4.50,
-            'line_cost': 4.32
-        },
-        {
-            'name': 'eggs',
-            'qty': 12.0,
-            'unit': 'each',
-            'unit_cost': 0.18,
-            'line_cost': 2.16
-        },
-    ]
+from src.calculator import LineInput, PricingCalculator, QuoteCalculation
+
+# Expected totals for sample_materials with 1.2 labor hours at the default rates
+_EXPECTED_MATERIALS = 1.73 + 1.01 + 4.32 + 2.16
+_EXPECTED_LABOR = 1.2 * 15.0
+_EXPECTED_SUBTOTAL = _EXPECTED_MATERIALS + _EXPECTED_LABOR
+_EXPECTED_MARKUP = _EXPECTED_SUBTOTAL * 0.30
+_EXPECTED_BEFORE_VAT = _EXPECTED_SUBTOTAL + _EXPECTED_MARKUP
+_EXPECTED_VAT = _EXPECTED_BEFORE_VAT * 0.20
+_EXPECTED_TOTAL = _EXPECTED_BEFORE_VAT + _EXPECTED_VAT
 
 
 class TestPricingCalculator:
@@ -66,23 +30,28 @@ class TestPricingCalculator:
         assert calc.markup_pct == 0.30
         assert calc.vat_pct == 0.20
 
-    def test_invalid_labor_rate(self):
-        """Test negative labor rate raises error"""
-        with pytest.raises(ValueError):
-            PricingCalculator(labor_rate=-5)
+    def test_rate_changes_apply_to_quotes(self, sample_materials):
+        """Test reassigned rates are used by calculate_quote"""
+        calc = PricingCalculator()
+        calc.markup_pct = 0.0
+        calc.vat_pct = 0.0
 
-    def test_invalid_markup(self):
-        """Test negative markup raises error"""
-        with pytest.raises(ValueError):
-            PricingCalculator(markup_pct=-0.1)
-
-    def test_invalid_vat(self):
-        """Test invalid VAT raises error"""
-        with pytest.raises(ValueError):
-            PricingCalculator(vat_pct=1.5)
+        result = calc.calculate_quote(sample_materials, 1.2)
 
+        assert result.markup_value == 0.0
+        assert result.vat_value == 0.0
+        assert result.total == result.subtotal
+
+    @pytest.mark.parametrize("kwargs", [
+        {'labor_rate': -5},
+        {'markup_pct': -0.1},
+        {'vat_pct': 1.5},
+        {'vat_pct': -0.1},
+    ])
+    def test_invalid_rates(self, kwargs):
+        """Test negative rates and out-of-range VAT raise errors"""
         with pytest.raises(ValueError):
-            PricingCalculator(vat_pct=-0.1)
+            PricingCalculator(**kwargs)
 
     def test_calculate_quote(self, calculator, sample_materials):
         """Test complete quote calculation"""
@@ -94,32 +63,14 @@ class TestPricingCalculator:
         # Verify it returns QuoteCalculation object
         assert isinstance(calc, QuoteCalculation)
 
-        # Verify materials subtotal
-        expected_materials = sum(m['line_cost'] for m in sample_materials)
-        assert calc.materials_subtotal == pytest.approx(expected_materials, 0.01)
-
-        # Verify labor cost
-        assert calc.labor_cost == pytest.approx(1.2 * 15.0, 0.01)
-
-        # Verify subtotal
-        expected_subtotal = expected_materials + (1.2 * 15.0)
-        assert calc.subtotal == pytest.approx(expected_subtotal, 0.01)
-
-        # Verify markup
-        expected_markup = expected_subtotal * 0.30
-        assert calc.markup_value == pytest.approx(expected_markup, 0.01)
-
-        # Verify price before VAT
-        expected_before_vat = expected_subtotal + expected_markup
-        assert calc.price_before_vat == pytest.approx(expected_before_vat, 0.01)
-
-        # Verify VAT
-        expected_vat = expected_before_vat * 0.20
-        assert calc.vat_value == pytest.approx(expected_vat, 0.01)
-
-        # Verify total
-        expected_total = expected_before_vat + expected_vat
-        assert calc.total == pytest.approx(expected_total, 0.01)
+        # Verify each stage of the pricing chain
+        assert calc.materials_subtotal == pytest.approx(_EXPECTED_MATERIALS, 0.01)
+        assert calc.labor_cost == pytest.approx(_EXPECTED_LABOR, 0.01)
+        assert calc.subtotal == pytest.approx(_EXPECTED_SUBTOTAL, 0.01)
+        assert calc.markup_value == pytest.approx(_EXPECTED_MARKUP, 0.01)
+        assert calc.price_before_vat == pytest.approx(_EXPECTED_BEFORE_VAT, 0.01)
+        assert calc.vat_value == pytest.approx(_EXPECTED_VAT, 0.01)
+        assert calc.total == pytest.approx(_EXPECTED_TOTAL, 0.01)
 
     def test_zero_labor(self, calculator, sample_materials):
         """Test with no labor hours"""
@@ -171,6 +122,21 @@ class TestPricingCalculator:
         line_cost = calculator.calculate_line_cost(qty=2.0, unit_cost=3.5)
         assert line_cost == 7.0
 
+    def test_calculate_line_costs(self, calculator):
+        """Test batch line cost calculation matches single-line results"""
+        quantities = [1.92, 2.0, 0.024]
+        unit_costs = [0.90, 3.5, 3.00]
+
+        line_costs = calculator.calculate_line_costs(quantities, unit_costs)
+
+        assert line_costs == [
+            calculator.calculate_line_cost(qty, cost)
+            for qty, cost in zip(quantities, unit_costs, strict=True)
+        ]
+
+        with pytest.raises(ValueError):
+            calculator.calculate_line_costs([1.0, 2.0], [0.5])
+
     def test_apply_discount(self, calculator, sample_materials):
         """Test discount application"""
         calc = calculator.calculate_quote(sample_materials, 1.2)
@@ -190,15 +156,13 @@ class TestPricingCalculator:
         assert discounted.materials_subtotal == calc.materials_subtotal
         assert discounted.labor_cost == calc.labor_cost
 
-    def test_apply_discount_invalid(self, calculator, sample_materials):
+    @pytest.mark.parametrize("discount_pct", [-0.1, 1.5])
+    def test_apply_discount_invalid(self, calculator, sample_materials, discount_pct):
         """Test discount with invalid percentage"""
         calc = calculator.calculate_quote(sample_materials, 1.2)
 
         with pytest.raises(ValueError):
-            calculator.apply_discount(calc, -0.1)
-
-        with pytest.raises(ValueError):
-            calculator.apply_discount(calc, 1.5)
+            calculator.apply_discount(calc, discount_pct)
 
     def test_get_breakdown_summary(self, calculator, sample_materials):
         """Test breakdown summary formatting"""
@@ -211,7 +175,7 @@ class TestPricingCalculator:
         assert "TOTAL" in summary
         assert str(calc.total) in summary
 
-    def test_real_world_example(self):
+    def test_real_world_example(self, sample_materials_full):
         """Test with actual specification example"""
         # 24 cupcakes example from spec
         calculator = PricingCalculator(
@@ -220,17 +184,7 @@ class TestPricingCalculator:
             vat_pct=0.20
         )
 
-        materials = [
-            {'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73},
-            {'name': 'sugar', 'qty': 1.44, 'unit': 'kg', 'unit_cost': 0.70, 'line_cost': 1.01},
-            {'name': 'butter', 'qty': 0.96, 'unit': 'kg', 'unit_cost': 4.50, 'line_cost': 4.32},
-            {'name': 'eggs', 'qty': 12.0, 'unit': 'each', 'unit_cost': 0.18, 'line_cost': 2.16},
-            {'name': 'milk', 'qty': 1.2, 'unit': 'L', 'unit_cost': 0.60, 'line_cost': 0.72},
-            {'name': 'vanilla', 'qty': 24.0, 'unit': 'ml', 'unit_cost': 0.05, 'line_cost': 1.20},
-            {'name': 'baking_powder', 'qty': 0.024, 'unit': 'kg', 'unit_cost': 3.00, 'line_cost': 0.07},
-        ]
-
-        calc = calculator.calculate_quote(materials, labor_hours=1.2)
+        calc = calculator.calculate_quote(sample_materials_full, labor_hours=1.2)
 
         # Verify key totals
         assert calc.materials_subtotal == pytest.approx(11.21, 0.1)
@@ -261,46 +215,15 @@ class TestPricingCalculator:
         assert 'unit_cost' in first_line
         assert 'line_cost' in first_line
 
-    def test_material_line_dataclass(self):
-        """Test MaterialLine dataclass"""
-        line = MaterialLine(
-            name='flour',
-            qty=1.92,
-            unit='kg',
-            unit_cost=0.90,
-            line_cost=1.73
-        )
-
-        assert line.name == 'flour'
-        assert line.qty == 1.92
-        assert line.unit == 'kg'
-        assert line.unit_cost == 0.90
-        assert line.line_cost == 1.73
-
-    def test_quote_calculation_dataclass(self):
-        """Test QuoteCalculation dataclass"""
-        lines = [
-            MaterialLine('flour', 1.92, 'kg', 0.90, 1.73)
-        ]
+    def test_line_input_records(self, calculator, sample_materials):
+        """Test LineInput records price the same as material dicts"""
+        records = [LineInput(**m) for m in sample_materials]
 
-        calc = QuoteCalculation(
-            lines=lines,
-            materials_subtotal=1.73,
-            labor_hours=1.0,
-            labor_rate=15.0,
-            labor_cost=15.0,
-            subtotal=16.73,
-            markup_pct=0.30,
-            markup_value=5.02,
-            price_before_vat=21.75,
-            vat_pct=0.20,
-            vat_value=4.35,
-            total=26.10
-        )
+        assert records[0]['unit_cost'] == 0.90
+        with pytest.raises(KeyError):
+            records[0]['missing']
 
-        assert calc.total == 26.10
-        assert len(calc.lines) == 1
-        assert calc.materials_subtotal == 1.73
+        assert calculator.calculate_quote(records, 1.2) == calculator.calculate_quote(sample_materials, 1.2)
 
     def test_rounding(self, calculator):
         """Test that all monetary values are rounded to 2 decimals"""
@@ -311,10 +234,8 @@ class TestPricingCalculator:
         calc = calculator.calculate_quote(materials, 1.111)
 
         # All monetary values should have at most 2 decimal places
-        assert calc.materials_subtotal == round(calc.materials_subtotal, 2)
-        assert calc.labor_cost == round(calc.labor_cost, 2)
-        assert calc.subtotal == round(calc.subtotal, 2)
-        assert calc.markup_value == round(calc.markup_value, 2)
-        assert calc.price_before_vat == round(calc.price_before_vat, 2)
-        assert calc.vat_value == round(calc.vat_value, 2)
-        assert calc.total == round(calc.total, 2)
+        values = (
+            calc.materials_subtotal, calc.labor_cost, calc.subtotal, calc.markup_value,
+            calc.price_before_vat, calc.vat_value, calc.total,
+        )
+        assert values == tuple(round(v, 2) for v in values)
@@ -1,68 +1,81 @@
 """Tests for unit converter"""
 import pytest
 
-from src.converter import Unit, UnitConversionError, UnitConverter
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance"""
-    return UnitConverter()
+from src.converter import UnitConversionError, UnitConverter
 
 
 class TestUnitConverter:
     """Test suite for unit converter"""
 
-    def test_kg_to_g(self, converter):
-        """Test kg to g conversion"""
-        assert converter.convert(1, 'kg', 'g') == 1000
-        assert converter.convert(0.5, 'kg', 'g') == 500
-        assert converter.convert(2.5, 'kg', 'g') == 2500
-
-    def test_g_to_kg(self, converter):
-        """Test g to kg conversion"""
-        assert converter.convert(1000, 'g', 'kg') == 1.0
-        assert converter.convert(500, 'g', 'kg') == 0.5
-        assert converter.convert(1, 'g', 'kg') == 0.001
-
-    def test_L_to_ml(self, converter):
-        """Test L to ml conversion"""
-        assert converter.convert(1, 'L', 'ml') == 1000
-        assert converter.convert(0.5, 'L', 'ml') == 500
-        assert converter.convert(1.5, 'L', 'ml') == 1500
-
-    def test_ml_to_L(self, converter):
-        """Test ml to L conversion"""
-        assert converter.convert(1000, 'ml', 'L') == 1.0
-        assert converter.convert(500, 'ml', 'L') == 0.5
-        assert converter.convert(250, 'ml', 'L') == 0.25
-
-    def test_same_unit(self, converter):
-        """Converting to same unit should return same value"""
-        assert converter.convert(5, 'kg', 'kg') == 5
-        assert converter.convert(100, 'ml', 'ml') == 100
-        assert converter.convert(10, 'each', 'each') == 10
-
-    def test_incompatible_units(self, converter):
+    def test_convert_uses_overridden_table(self):
+        """Test subclass and instance CONVERSIONS tables are honoured"""
+        class CupConverter(UnitConverter):
+            CONVERSIONS = {**UnitConverter.CONVERSIONS, ('kg', 'g'): 1001.0}
+
+        assert CupConverter().convert(1, 'kg', 'g') == 1001.0
+
+        converter = UnitConverter()
+        converter.CONVERSIONS = {('kg', 'g'): 999.0}
+        assert converter.convert(1, 'kg', 'g') == 999.0
+        assert UnitConverter().convert(1, 'kg', 'g') == 1000.0
+
+    def test_subclass_extends_unit_families(self):
+        """A subclass adding units to a family can look them up and normalize them"""
+        class DozenConverter(UnitConverter):
+            CONVERSIONS = {**UnitConverter.CONVERSIONS, ('dozen', 'each'): 12.0, ('dozen', 'dozen'): 1.0}
+            UNIT_FAMILIES = {**UnitConverter.UNIT_FAMILIES, 'count': {'each', 'dozen'}}
+
+        converter = DozenConverter()
+        assert converter.get_unit_family('dozen') == 'count'
+        assert converter.normalize_to_base_unit(1, 'dozen') == (12.0, 'each')
+        assert converter.can_convert('dozen', 'each')
+        assert not UnitConverter().can_convert('dozen', 'each')
+        with pytest.raises(ValueError):
+            UnitConverter().get_unit_family('dozen')
+
+    @pytest.mark.parametrize("value,from_unit,to_unit,expected", [
+        (1, 'kg', 'g', 1000),
+        (0.5, 'kg', 'g', 500),
+        (2.5, 'kg', 'g', 2500),
+        (1000, 'g', 'kg', 1.0),
+        (500, 'g', 'kg', 0.5),
+        (1, 'g', 'kg', 0.001),
+        (1, 'L', 'ml', 1000),
+        (0.5, 'L', 'ml', 500),
+        (1.5, 'L', 'ml', 1500),
+        (1000, 'ml', 'L', 1.0),
+        (500, 'ml', 'L', 0.5),
+        (250, 'ml', 'L', 0.25),
+        # Converting to same unit should return same value
+        (5, 'kg', 'kg', 5),
+        (100, 'ml', 'ml', 100),
+        (10, 'each', 'each', 10),
+    ])
+    def test_convert(self, converter, value, from_unit, to_unit, expected):
+        """Test conversion between compatible units"""
+        assert converter.convert(value, from_unit, to_unit) == expected
+
+    @pytest.mark.parametrize("from_unit,to_unit", [
+        ('kg', 'L'),
+        ('ml', 'kg'),
+        ('each', 'kg'),
+    ])
+    def test_incompatible_units(self, converter, from_unit, to_unit):
         """Should raise error for incompatible units"""
         with pytest.raises(UnitConversionError):
-            converter.convert(1, 'kg', 'L')
-
-        with pytest.raises(UnitConversionError):
-            converter.convert(1, 'ml', 'kg')
-
-        with pytest.raises(UnitConversionError):
-            converter.convert(1, 'each', 'kg')
-
-    def test_can_convert(self, converter):
+            converter.convert(1, from_unit, to_unit)
+
+    @pytest.mark.parametrize("from_unit,to_unit,expected", [
+        ('kg', 'g', True),
+        ('g', 'kg', True),
+        ('L', 'ml', True),
+        ('kg', 'kg', True),
+        ('kg', 'L', False),
+        ('each', 'kg', False),
+    ])
+    def test_can_convert(self, converter, from_unit, to_unit, expected):
         """Test can_convert method"""
-        assert converter.can_convert('kg', 'g')
-        assert converter.can_convert('g', 'kg')
-        assert converter.can_convert('L', 'ml')
-        assert converter.can_convert('kg', 'kg')
-
-        assert not converter.can_convert('kg', 'L')
-        assert not converter.can_convert('each', 'kg')
+        assert converter.can_convert(from_unit, to_unit) is expected
 
     def test_get_unit_family(self, converter):
         """Test unit family detection"""
@@ -140,14 +153,6 @@ class TestUnitConverter:
         vanilla_L = converter.convert(vanilla_ml, 'ml', 'L')
         assert vanilla_L == 0.024
 
-    def test_unit_enum(self):
-        """Test Unit enum"""
-        assert Unit.KILOGRAM == "kg"
-        assert Unit.GRAM == "g"
-        assert Unit.LITER == "L"
-        assert Unit.MILLILITER == "ml"
-        assert Unit.EACH == "each"
-
     def test_whitespace_handling(self, converter):
         """Test that whitespace is handled correctly"""
         assert converter.convert(1000, ' g ', ' kg ') == 1.0
@@ -1,4 +1,8 @@
 """Tests for database tool"""
+import sqlite3
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
 import pytest
 
 from src.tools.database_tool import (
@@ -14,6 +18,52 @@ def test_initialization(temp_database):
     assert db.database_path == temp_database
 
 
+def test_initialization_with_path_object(temp_database):
+    """Test a pathlib.Path database location is accepted"""
+    with DatabaseTool(Path(temp_database)) as db:
+        assert db.get_material_cost('flour') is not None
+
+
+def test_materials_database_is_read_only(materials_database):
+    """Test the shared sample database rejects writes"""
+    with DatabaseTool(materials_database) as db:
+        assert db.get_material_cost('flour') is not None
+        with pytest.raises(sqlite3.OperationalError):
+            db.add_material('rye', 'kg', 2.10)
+
+
+def test_connection_reused_until_closed(temp_database):
+    """Test queries share one connection and close() releases it"""
+    with DatabaseTool(temp_database) as db:
+        db.get_material_cost('flour')
+        conn = db._conn
+        db.get_materials_bulk(['sugar', 'butter'])
+        assert db._conn is conn
+
+    assert db._conn is None
+
+
+def test_shared_memory_uri():
+    """Test opening a shared in-memory database by URI"""
+    uri = "file:test_shared_memory_uri?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True)
+    keeper.execute(
+        "CREATE TABLE materials (id INTEGER PRIMARY KEY, name TEXT, unit TEXT, "
+        "unit_cost REAL, currency TEXT, last_updated TEXT)"
+    )
+    keeper.execute(
+        "INSERT INTO materials (name, unit, unit_cost, currency, last_updated) "
+        "VALUES ('flour', 'kg', 0.90, 'GBP', '2025-09-01')"
+    )
+    keeper.commit()
+
+    try:
+        with DatabaseTool(uri) as db:
+            assert db.get_material_cost('flour').unit_cost == 0.90
+    finally:
+        keeper.close()
+
+
 def test_get_material_cost(temp_database):
     """Test getting a single material cost"""
     db = DatabaseTool(temp_database)
@@ -27,6 +77,53 @@ def test_get_material_cost(temp_database):
     assert flour.currency == 'GBP'
 
 
+def test_get_material_cost_cached(temp_database):
+    """Test repeat lookups are served from the cache until the material changes"""
+    with DatabaseTool(temp_database) as db:
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+
+        flour = db.get_material_cost('flour')
+        assert db.get_material_cost('FLOUR') is flour
+        assert db.material_exists('Flour')
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+        assert len(selects) == 1
+        with pytest.raises(FrozenInstanceError):
+            flour.unit_cost = 0.0
+
+        db.update_material_cost('flour', 0.95)
+        assert db.get_material_cost('flour').unit_cost == 0.95
+
+    with DatabaseTool(temp_database, cache=False) as db:
+        assert db.get_material_cost('flour') is not db.get_material_cost('flour')
+
+
+def test_non_ascii_case_matches_uncached(temp_database):
+    """Test cached lookups fold case like SQLite NOCASE (ASCII letters only)"""
+    with DatabaseTool(temp_database) as db:
+        db.add_material('Éclair mix', 'kg', 4.20)
+
+    for cache in (True, False):
+        with DatabaseTool(temp_database, cache=cache) as db:
+            assert db.get_material_cost('Éclair MIX').name == 'Éclair mix'
+            assert db.get_material_cost('éclair mix') is None
+            assert not db.material_exists('éclair mix')
+            assert list(db.get_materials_bulk(['ÉCLAIR MIX', 'Éclair Mix'])) == ['Éclair mix']
+            assert db.get_materials_bulk(['éclair mix']) == {}
+
+
+def test_cache_sees_other_connections_writes(temp_database):
+    """Test the cached materials reload after another connection commits"""
+    with DatabaseTool(temp_database) as reader, DatabaseTool(temp_database) as writer:
+        assert reader.get_material_cost('flour').unit_cost == 0.90
+
+        writer.update_material_cost('flour', 1.25)
+        writer.add_material('rye', 'kg', 2.10)
+
+        assert reader.get_material_cost('flour').unit_cost == 1.25
+        assert reader.material_exists('rye')
+
+
 def test_get_material_not_found(temp_database):
     """Test querying non-existent material"""
     db = DatabaseTool(temp_database)
@@ -63,6 +160,29 @@ def test_get_materials_bulk(temp_database):
     assert materials['flour']['unit_cost'] == 0.90
 
 
+def test_get_materials_bulk_single_query(temp_database):
+    """Test bulk retrieval issues one SELECT regardless of how many names"""
+    with DatabaseTool(temp_database) as db:
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+
+        materials = db.get_materials_bulk(['flour', 'sugar', 'butter', 'eggs', 'milk'])
+
+    assert len(materials) == 5
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+    assert len(selects) == 1
+
+
+def test_get_materials_bulk_objects(temp_database):
+    """Test bulk retrieval as MaterialCost objects matches names in any case"""
+    with DatabaseTool(temp_database) as db:
+        materials = db.get_materials_bulk_objects(['FLOUR', 'Sugar', 'chocolate'])
+
+    assert set(materials) == {'flour', 'sugar'}
+    assert isinstance(materials['flour'], MaterialCost)
+    assert materials['sugar'].unit_cost == 0.70
+
+
 def test_get_materials_bulk_with_missing(temp_database):
     """Test bulk retrieval with missing materials"""
     db = DatabaseTool(temp_database)
@@ -81,6 +201,18 @@ def test_get_materials_bulk_empty(temp_database):
     assert materials == {}
 
 
+def test_get_materials_bulk_mixed_case(temp_database, caplog):
+    """Test repeated and mixed-case names are looked up once and not reported missing"""
+    with DatabaseTool(temp_database) as db:
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+        materials = db.get_materials_bulk(['Flour', 'flour', 'SUGAR'])
+
+    assert set(materials) == {'flour', 'sugar'}
+    assert "IN ('flour','sugar')" in ''.join(statements)
+    assert 'Missing materials' not in caplog.text
+
+
 def test_list_all_materials(temp_database):
     """Test listing all materials"""
     db = DatabaseTool(temp_database)
@@ -112,6 +244,28 @@ def test_search_materials(temp_database):
     assert len(results) == 0
 
 
+def test_search_materials_like_wildcards(temp_database):
+    """Test search patterns keep SQL LIKE wildcard semantics"""
+    with DatabaseTool(temp_database) as db:
+        assert [m.name for m in db.search_materials('f%r')] == ['flour']
+        assert [m.name for m in db.search_materials('b_tter')] == ['butter']
+        assert db.search_materials('f.our') == []
+
+
+def test_search_materials_in_memory(temp_database):
+    """Test searches after the first run no SQL and see writes made through the tool"""
+    with DatabaseTool(temp_database) as db:
+        assert [m.name for m in db.search_materials('SU')] == ['sugar']
+
+        statements = []
+        db._conn.set_trace_callback(statements.append)
+        assert [m.name for m in db.search_materials('ou')] == ['flour']
+        assert not [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+
+        db.add_material('sourdough_starter', 'kg', 1.20)
+        assert [m.name for m in db.search_materials('ou')] == ['flour', 'sourdough_starter']
+
+
 def test_material_exists(temp_database):
     """Test material existence check"""
     db = DatabaseTool(temp_database)
@@ -151,6 +305,19 @@ def test_get_database_info(temp_database):
     assert info['path'] == temp_database
 
 
+def test_summaries_follow_writes(temp_database):
+    """Test cached listings and counts are refreshed by writes through the tool"""
+    with DatabaseTool(temp_database) as db:
+        assert db.get_material_count() == 9
+
+        db.add_material('yeast', 'g', 0.02, last_updated='2025-10-01')
+
+        assert db.get_material_count() == 10
+        assert 'yeast' in [m.name for m in db.list_all_materials()]
+        assert 'g' in db.get_available_units()
+        assert db.get_database_info()['last_updated'] == '2025-10-01'
+
+
 def test_add_material(temp_database):
     """Test adding a new material"""
     db = DatabaseTool(temp_database)
@@ -168,6 +335,9 @@ def test_add_material(temp_database):
     success = db.add_material('cocoa', 'kg', 7.00, 'GBP')
     assert success is False
 
+    # Failed insert must not leave a transaction open on the shared connection
+    assert not db._conn.in_transaction
+
 
 def test_update_material_cost(temp_database):
     """Test updating material cost"""
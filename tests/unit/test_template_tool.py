@@ -1,10 +1,21 @@
 """Tests for template renderer tool"""
+import json
+import os
 import tempfile
+from datetime import date, timedelta
 from pathlib import Path
+from types import MappingProxyType
 
+import chevron
 import pytest
 
-from src.tools.template_tool import QuoteDataBuilder, TemplateRenderError, TemplateTool
+from src.tools.template_tool import (
+    LineItem,
+    QuoteData,
+    QuoteDataBuilder,
+    TemplateRenderError,
+    TemplateTool,
+)
 
 
 @pytest.fixture
@@ -31,6 +42,7 @@ def template_file(temp_dir):
 - {{name}}: {{qty}} {{unit}} @ {{unit_cost}} = {{line_cost}}
 {{/lines}}
 
+**Materials:** {{currency}}{{materials_subtotal}}
 **Total:** {{currency}}{{total}}
 
 {{#notes}}
@@ -41,36 +53,41 @@ def template_file(temp_dir):
     return template_path
 
 
+# Sample quote data, read-only so every test can share one instance
+_SAMPLE_DATA = MappingProxyType({
+    'quote_id': 'Q001',
+    'quote_date': '2025-12-18',
+    'valid_until': '2026-01-17',
+    'company_name': 'Test Bakery',
+    'customer_name': 'Test Customer',
+    'job_type': 'cupcakes',
+    'quantity': 24,
+    'due_date': '2025-12-25',
+    # Plain dicts, as QuoteData only converts dict lines; the tools copy rather than mutate them
+    'lines': (
+        {'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73},
+        {'name': 'sugar', 'qty': 1.44, 'unit': 'kg', 'unit_cost': 0.70, 'line_cost': 1.01},
+    ),
+    'materials_subtotal': 2.74,
+    'labor_hours': 1.2,
+    'labor_rate': 15.0,
+    'labor_cost': 18.0,
+    'subtotal': 20.74,
+    'markup_pct': 30,
+    'markup_value': 6.22,
+    'price_before_vat': 26.96,
+    'vat_pct': 20,
+    'vat_value': 5.39,
+    'total': 32.35,
+    'currency': 'GBP',
+    'notes': ''
+})
+
+
 @pytest.fixture
 def sample_data():
-    """Sample quote data"""
-    return {
-        'quote_id': 'Q001',
-        'quote_date': '2025-12-18',
-        'valid_until': '2026-01-17',
-        'company_name': 'Test Bakery',
-        'customer_name': 'Test Customer',
-        'job_type': 'cupcakes',
-        'quantity': 24,
-        'due_date': '2025-12-25',
-        'lines': [
-            {'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73},
-            {'name': 'sugar', 'qty': 1.44, 'unit': 'kg', 'unit_cost': 0.70, 'line_cost': 1.01},
-        ],
-        'materials_subtotal': 2.74,
-        'labor_hours': 1.2,
-        'labor_rate': 15.0,
-        'labor_cost': 18.0,
-        'subtotal': 20.74,
-        'markup_pct': 30,
-        'markup_value': 6.22,
-        'price_before_vat': 26.96,
-        'vat_pct': 20,
-        'vat_value': 5.39,
-        'total': 32.35,
-        'currency': 'GBP',
-        'notes': ''
-    }
+    """Sample quote data (read-only; copy with {**sample_data} to vary it)"""
+    return _SAMPLE_DATA
 
 
 class TestTemplateTool:
@@ -137,6 +154,19 @@ class TestTemplateTool:
         assert output_path.read_text() == content
         assert 'Q001' in output_path.name
 
+    def test_save_many(self, template_file, temp_dir):
+        """Test saving several quotes keeps input order"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+
+        paths = tool.save_many([(f"Quote {i}", f"Q00{i}") for i in range(3)])
+
+        assert [p.name for p in paths] == ['quote_Q000.md', 'quote_Q001.md', 'quote_Q002.md']
+        assert paths[2].read_text() == "Quote 2"
+        assert tool.save_many([]) == []
+
     def test_render_and_save(self, template_file, temp_dir, sample_data):
         """Test render and save combined"""
         tool = TemplateTool(
@@ -163,6 +193,107 @@ class TestTemplateTool:
         # Our test template has all required placeholders
         assert len(missing) == 0
 
+    def test_validate_template_reports_missing(self, temp_dir):
+        """Test validation lists placeholders absent from the template"""
+        template_path = temp_dir / "partial.md"
+        template_path.write_text("# {{ company_name }} {{quote_id}} {{#lines}}{{name}}{{/lines}}")
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        assert tool.validate_template() == [
+            'customer_name', 'job_type', 'quantity', 'total', 'currency'
+        ]
+
+    def test_compiled_render_matches_chevron(self, template_file, temp_dir, sample_data):
+        """Test compiled rendering produces the same output as chevron"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+        assert tool._program is not None
+
+        for notes in ('', 'Deliver <before> 9 & ring "twice"'):
+            data = {**sample_data, 'notes': notes, 'customer_name': 'Smith & Sons'}
+            expected = chevron.render(tool.template, tool._format_data(data))
+            assert tool.render(data) == expected
+
+    def test_compiled_render_nested_sections(self, temp_dir, sample_data):
+        """Test nested sections compile and match chevron"""
+        template_path = temp_dir / "nested.md"
+        template_path.write_text(
+            "{{#lines}}{{#name}}{{name}}{{^notes}} ({{currency}}){{/notes}};{{/name}}{{/lines}}"
+        )
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        assert tool._program is not None
+        assert tool.render(sample_data) == "flour (GBP);sugar (GBP);"
+        assert tool.render(sample_data) == chevron.render(tool.template, tool._format_data(sample_data))
+
+    def test_compiled_literals_merged(self, temp_dir, sample_data):
+        """Test text split by comments compiles to one literal op"""
+        template_path = temp_dir / "comments.md"
+        template_path.write_text("Quote {{! internal }}for {{customer_name}}{{! end }}.")
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        assert [tag for tag, _, _ in tool._program] == ['literal', 'variable', 'literal']
+        assert tool.render(sample_data) == "Quote for Test Customer."
+
+    def test_render_falls_back_for_unsupported_template(self, temp_dir, sample_data):
+        """Test templates with dotted keys are rendered by chevron"""
+        template_path = temp_dir / "dotted.md"
+        template_path.write_text("{{#lines}}{{name}};{{/lines}}{{lines.0.name}}")
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        assert tool._program is None
+        assert tool.render(sample_data) == "flour;sugar;flour"
+
+    @pytest.mark.parametrize("template, extra, expected", [
+        ("{{=<% %>=}}Hi <% customer_name %> total <% total %>", {'customer_name': 'Cust', 'total': 5}, "Hi Cust total 5.00"),
+        ("{{due-date}}", {'due-date': 'HYPH'}, "HYPH"),
+        ("{{2nd}}", {'2nd': 'SECOND'}, "SECOND"),
+    ])
+    def test_render_keeps_keys_outside_identifier_syntax(self, temp_dir, sample_data, template, extra, expected):
+        """Test custom delimiters and non-identifier keys still receive their values"""
+        template_path = temp_dir / "keys.md"
+        template_path.write_text(template)
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        assert tool.render({**sample_data, **extra}) == expected
+
+    def test_parsed_template_shared_until_modified(self, template_file, temp_dir):
+        """Test instances share the parsed template until the file changes"""
+        first = TemplateTool(template_path=str(template_file), output_dir=str(temp_dir / "output"))
+        second = TemplateTool(template_path=str(template_file), output_dir=str(temp_dir / "output"))
+        assert second._program is first._program
+        assert second._template_keys is first._template_keys
+
+        template_file.write_text("# {{company_name}} v2")
+        stat = template_file.stat()
+        os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        updated = TemplateTool(template_path=str(template_file), output_dir=str(temp_dir / "output"))
+        assert updated.template == "# {{company_name}} v2"
+        assert updated._program is not first._program
+
     def test_validate_template_missing_file(self, temp_dir):
         """Test validation with missing template"""
         # TemplateTool.__init__ raises FileNotFoundError if template doesn't exist
@@ -210,6 +341,52 @@ class TestTemplateTool:
         assert formatted['materials_subtotal'] == '10.50'
         assert formatted['total'] == '44.46'
 
+    def test_percentage_formatting_non_finite(self, temp_dir, sample_data):
+        """Test non-finite percentages render instead of raising"""
+        template_path = temp_dir / "rates.md"
+        template_path.write_text("{{markup_pct}} {{vat_pct}}")
+
+        tool = TemplateTool(
+            template_path=str(template_path),
+            output_dir=str(temp_dir / "output")
+        )
+
+        data = {**sample_data, 'markup_pct': float('nan'), 'vat_pct': float('inf')}
+        assert tool.render(data) == "nan% inf%"
+
+        # Signed zeros keep their own format whichever is rendered first
+        assert tool.render({**sample_data, 'markup_pct': -0.0, 'vat_pct': 0.0}) == "-0% 0%"
+        assert tool.render({**sample_data, 'markup_pct': 0.0, 'vat_pct': -0.0}) == "0% -0%"
+
+    def test_signed_zero_formatting(self, template_file, temp_dir, sample_data):
+        """Test 0.0 and -0.0 format independently of which was seen first"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+
+        for first, second in ((-0.0, 0.0), (0.0, -0.0)):
+            assert tool._format_data({**sample_data, 'total': first})['total'] == f"{first:.2f}"
+            assert tool._format_data({**sample_data, 'total': second})['total'] == f"{second:.2f}"
+
+    def test_line_item_formatting(self, template_file, temp_dir, sample_data):
+        """Test builder line items format and render like dict lines"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+        line = LineItem('flour', 1.92, 'kg', 0.9, 1.728)
+
+        formatted = tool._format_data({**sample_data, 'lines': [line]})
+        formatted_line = formatted['lines'][0]
+
+        assert formatted_line.qty == '1.92'
+        assert formatted_line.unit_cost == '0.90'
+        assert formatted_line.line_cost == '1.73'
+        assert line.line_cost == 1.728  # Source line is left untouched
+        assert 'labor_rate' not in formatted  # Not referenced by the template
+        assert '- flour: 1.92 kg @ 0.90 = 1.73' in tool.render({**sample_data, 'lines': [line]})
+
 
 class TestQuoteDataBuilder:
     """Test suite for QuoteDataBuilder"""
@@ -232,6 +409,10 @@ class TestQuoteDataBuilder:
         assert data['quote_id'] == 'Q001'
         assert data['company_name'] == 'Test Bakery'
         assert data['total'] == 30.78
+        assert data['lines'] == [
+            {'name': 'flour', 'qty': 1.92, 'unit': 'kg', 'unit_cost': 0.90, 'line_cost': 1.73}
+        ]
+        assert json.loads(json.dumps(data))['lines'][0]['name'] == 'flour'
 
     def test_builder_validation_error(self):
         """Test builder validation"""
@@ -251,7 +432,14 @@ class TestQuoteDataBuilder:
         assert builder.data['company_name'] == 'Bakery Co'
         assert builder.data['customer_name'] == 'Customer Name'
         assert builder.data['quote_date'] == '2025-12-18'
-        assert 'valid_until' in builder.data
+        assert builder.data['valid_until'] == '2026-01-17'
+
+    def test_builder_set_header_non_iso_date(self):
+        """Test non-ISO quote dates are kept, with validity counted from today"""
+        builder = QuoteDataBuilder().set_header('Q001', 'Bakery Co', 'Customer Name', '15/01/2026', 30)
+
+        assert builder.data['quote_date'] == '15/01/2026'
+        assert builder.data['valid_until'] == (date.today() + timedelta(days=30)).isoformat()
 
     def test_builder_set_project(self):
         """Test set_project method"""
@@ -272,8 +460,21 @@ class TestQuoteDataBuilder:
 
         assert result is builder
         assert len(builder.data['lines']) == 1
+        assert isinstance(builder.data['lines'][0], LineItem)
         assert builder.data['lines'][0]['name'] == 'flour'
 
+    def test_builder_set_materials_columnar(self):
+        """Test set_materials_columnar builds line items from columns"""
+        builder = QuoteDataBuilder()
+        result = builder.set_materials_columnar(['flour', 'eggs'], ['kg', 'unit'], [1.92, 6], [0.90, 0.25])
+
+        assert result is builder
+        assert [line['line_cost'] for line in builder.data['lines']] == [1.73, 1.5]
+        assert builder.data['lines'][1]['unit'] == 'unit'
+
+        with pytest.raises(ValueError):
+            builder.set_materials_columnar(['flour'], ['kg'], [1.0, 2.0], [0.90])
+
     def test_builder_set_labor(self):
         """Test set_labor method"""
         builder = QuoteDataBuilder()
@@ -363,6 +564,34 @@ class TestTemplateIntegration:
         if data.get('notes'):
             assert 'Please deliver by 9 AM' in content
 
+    def test_quote_data_rendering(self, template_file, temp_dir, sample_data):
+        """Test QuoteData renders the same as the equivalent dictionary"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+
+        quote = QuoteData(**sample_data)
+        data = quote.to_dict()
+
+        assert all(isinstance(line, LineItem) for line in quote.lines)
+        assert data.keys() == sample_data.keys()
+        assert tool.render(data) == tool.render(sample_data)
+
+    def test_quote_data_rendering_text_line_fields(self, template_file, temp_dir, sample_data):
+        """Test QuoteData lines with text quantities or costs render like dict lines"""
+        tool = TemplateTool(
+            template_path=str(template_file),
+            output_dir=str(temp_dir / "output")
+        )
+        line = {'name': 'flour', 'qty': '1.5 kg', 'unit': 'kg', 'unit_cost': 0.9, 'line_cost': 'n/a'}
+        data = {**sample_data, 'lines': [line]}
+
+        rendered = tool.render(QuoteData(**data).to_dict())
+
+        assert '- flour: 1.5 kg kg @ 0.90 = n/a' in rendered
+        assert rendered == tool.render(data)
+
     def test_error_handling(self, temp_dir):
         """Test error handling with invalid data"""
         # Create template with required field
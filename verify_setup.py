@@ -1,16 +1,84 @@
 #!/usr/bin/env python3
 """Verification script to check project setup"""
+import os
 import sys
-from pathlib import Path
+from collections import defaultdict
+
+# Files reported under "Configuration Files" (informational, not counted)
+CONFIG_FILES = [
+    ("pyproject.toml", "Project config (pyproject.toml)"),
+    ("requirements.txt", "Legacy requirements"),
+    (".env.example", "Environment template"),
+]
+
+# Required files, by report section
+REQUIRED_FILES = [
+    ("Core Source Files", [
+        ("src/__init__.py", "Package init"),
+        ("src/config.py", "Configuration"),
+        ("src/models.py", "Data models"),
+        ("src/calculator.py", "Pricing calculator"),
+        ("src/converter.py", "Unit converter"),
+        ("src/main.py", "Main entry point"),
+    ]),
+    ("Agent Components", [
+        ("src/agent/__init__.py", "Agent package"),
+        ("src/agent/orchestrator.py", "Agent orchestrator"),
+        ("src/agent/prompts.py", "System prompts"),
+    ]),
+    ("Tools", [
+        ("src/tools/__init__.py", "Tools package"),
+        ("src/tools/database_tool.py", "Database tool"),
+        ("src/tools/bom_tool.py", "BOM API tool"),
+        ("src/tools/template_tool.py", "Template tool"),
+    ]),
+    ("Resources", [
+        ("resources/materials.sqlite", "Materials database"),
+        ("resources/quote_template.md", "Quote template"),
+        ("resources/bakery_pricing_tool/app.py", "BOM API"),
+        ("resources/bakery_pricing_tool/docker-compose.yml", "Docker compose"),
+    ]),
+    ("Configuration", [
+        (".env.example", "Example environment"),
+        ("requirements.txt", "Dependencies"),
+        ("README.md", "README"),
+        (".gitignore", "Git ignore"),
+    ]),
+    ("Documentation", [
+        ("documentation/Implementation_Plan.md", "Implementation plan"),
+        ("documentation/01_Agent_Orchestrator.md", "Agent docs"),
+        ("documentation/02_Database_Tool.md", "Database docs"),
+        ("documentation/03_BOM_API_Tool.md", "BOM API docs"),
+    ]),
+]
+
+def find_existing(paths: list[str]) -> set[str]:
+    """Return the paths that exist, listing each parent directory once"""
+    by_parent = defaultdict(list)
+    for path in paths:
+        by_parent[os.path.dirname(path) or "."].append(path)
+
+    existing = set()
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue  # Missing parent: none of its children exist
+        existing.update(path for path in children if os.path.basename(path) in names)
+    return existing
+
+def format_check(path: str, description: str, exists: bool) -> str:
+    """Report line for one file check"""
+    if exists:
+        return f"✓ {description}: {path}"
+    return f"✗ {description}: {path} (MISSING)"
 
 def check_file_exists(path: str, description: str) -> bool:
     """Check if a file exists"""
-    if Path(path).exists():
-        print(f"✓ {description}: {path}")
-        return True
-    else:
-        print(f"✗ {description}: {path} (MISSING)")
-        return False
+    exists = os.path.exists(path)
+    print(format_check(path, description, exists))
+    return exists
 
 def main():
     """Run verification checks"""
@@ -34,63 +102,29 @@ def main():
         print("  Install: curl -LsSf https://astral.sh/uv/install.sh | sh")
     print()
     
+    # Look up every file up front, one directory listing per parent
+    existing = find_existing(
+        [path for path, _ in CONFIG_FILES]
+        + [path for _, files in REQUIRED_FILES for path, _ in files]
+    )
+
     # Check configuration files
-    print("Configuration Files:")
-    has_pyproject = check_file_exists("pyproject.toml", "Project config (pyproject.toml)")
-    has_requirements = check_file_exists("requirements.txt", "Legacy requirements")
-    has_env_example = check_file_exists(".env.example", "Environment template")
-    print()
+    report = ["Configuration Files:"]
+    report += [format_check(path, description, path in existing) for path, description in CONFIG_FILES]
+    report.append("")
     
     checks = []
     
-    # Core source files
-    print("Core Source Files:")
-    checks.append(check_file_exists("src/__init__.py", "Package init"))
-    checks.append(check_file_exists("src/config.py", "Configuration"))
-    checks.append(check_file_exists("src/models.py", "Data models"))
-    checks.append(check_file_exists("src/calculator.py", "Pricing calculator"))
-    checks.append(check_file_exists("src/converter.py", "Unit converter"))
-    checks.append(check_file_exists("src/main.py", "Main entry point"))
-    print()
-    
-    # Agent files
-    print("Agent Components:")
-    checks.append(check_file_exists("src/agent/__init__.py", "Agent package"))
-    checks.append(check_file_exists("src/agent/orchestrator.py", "Agent orchestrator"))
-    checks.append(check_file_exists("src/agent/prompts.py", "System prompts"))
-    print()
+    for section, files in REQUIRED_FILES:
+        report.append(f"{section}:")
+        for path, description in files:
+            exists = path in existing
+            checks.append(exists)
+            report.append(format_check(path, description, exists))
+        report.append("")
     
-    # Tools
-    print("Tools:")
-    checks.append(check_file_exists("src/tools/__init__.py", "Tools package"))
-    checks.append(check_file_exists("src/tools/database_tool.py", "Database tool"))
-    checks.append(check_file_exists("src/tools/bom_tool.py", "BOM API tool"))
-    checks.append(check_file_exists("src/tools/template_tool.py", "Template tool"))
-    print()
-    
-    # Resources
-    print("Resources:")
-    checks.append(check_file_exists("resources/materials.sqlite", "Materials database"))
-    checks.append(check_file_exists("resources/quote_template.md", "Quote template"))
-    checks.append(check_file_exists("resources/bakery_pricing_tool/app.py", "BOM API"))
-    checks.append(check_file_exists("resources/bakery_pricing_tool/docker-compose.yml", "Docker compose"))
-    print()
-    
-    # Configuration
-    print("Configuration:")
-    checks.append(check_file_exists(".env.example", "Example environment"))
-    checks.append(check_file_exists("requirements.txt", "Dependencies"))
-    checks.append(check_file_exists("README.md", "README"))
-    checks.append(check_file_exists(".gitignore", "Git ignore"))
-    print()
-    
-    # Documentation
-    print("Documentation:")
-    checks.append(check_file_exists("documentation/Implementation_Plan.md", "Implementation plan"))
-    checks.append(check_file_exists("documentation/01_Agent_Orchestrator.md", "Agent docs"))
-    checks.append(check_file_exists("documentation/02_Database_Tool.md", "Database docs"))
-    checks.append(check_file_exists("documentation/03_BOM_API_Tool.md", "BOM API docs"))
-    print()
+    # Emit the file report in one write
+    sys.stdout.write("\n".join(report) + "\n")
     
     # Summary
     print("=" * 60)